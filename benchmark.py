@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+
+import argparse, sys, os, json, hashlib, io, random, shutil, statistics, subprocess, tempfile, threading, time, zipfile
+import http.server
+
+## ⚠️ Disclaimer: This project is for educational, research and testing purposes only.
+
+############################
+##### LAUNCHER VERSION #####
+############################
+launcher_version = 0.6
+############################
+
+# End to end benchmark of nuxcraft-pycher.py against a local stand-in for the upstream hosts.
+# Everything (manifest, version JSON, asset index, objects, libraries, natives) is synthetic, so it runs offline.
+
+LAUNCHER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "nuxcraft-pycher.py")
+VERSION_ID = "bench-1.0"
+
+def human_bytes(n):
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if n < 1024 or unit == "GiB": return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+def parse_size(size_str):
+    # "512K", "20M", "1G" or plain bytes
+    size_str = size_str.upper().strip()
+    for suffix, mult in (("K", 1024), ("M", 1024**2), ("G", 1024**3)):
+        if size_str.endswith(suffix): return int(float(size_str[:-1]) * mult)
+    return int(size_str)
+
+# SYNTHETIC UPSTREAM
+def generate_tree(root, base_url, n_objects, n_libraries, seed):
+    # Writes www/ with the same layout the launcher expects upstream, returns (files, bytes)
+    rnd = random.Random(seed)
+    files, total = 0, 0
+
+    def put(rel, data):
+        nonlocal files, total
+        path = os.path.join(root, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f: f.write(data)
+        files, total = files + 1, total + len(data)
+        return hashlib.sha1(data).hexdigest(), len(data)
+
+    # Asset objects: mostly small json/lang/textures, a tail of large sounds (roughly like a real index)
+    objects = {}
+    for i in range(n_objects):
+        size = min(2 * 1024 * 1024, int(rnd.lognormvariate(9, 1.4)) + 64)
+        data = rnd.randbytes(size)
+        h = hashlib.sha1(data).hexdigest()
+        put(f"res/{h[:2]}/{h}", data)
+        name = f"minecraft/sounds/bench/s{i}.ogg" if i % 4 == 0 else f"minecraft/textures/bench/t{i}.png"
+        objects[name] = {"hash": h, "size": size}
+    index = json.dumps({"objects": objects}, separators=(",", ":")).encode()
+    ih, isz = put("indexes/bench.json", index)
+
+    # Libraries: ~100 jars from a few KiB to a few MiB, plus one natives jar with real zip members
+    libraries = []
+    for i in range(n_libraries):
+        size = min(8 * 1024 * 1024, int(rnd.lognormvariate(11.5, 1.3)) + 1024)
+        rel = f"org/bench/lib{i}/1.0/lib{i}-1.0.jar"
+        h, size = put(f"libs/{rel}", rnd.randbytes(size))
+        libraries.append({"name": f"org.bench:lib{i}:1.0", "downloads": {"artifact": {"path": rel, "url": f"{base_url}/libs/{rel}", "sha1": h, "size": size}}})
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        for n in ("liblwjgl.so", "liblwjgl_opengl.so", "libglfw.so", "libopenal.so", "liblwjgl_stb.so"):
+            z.writestr(f"linux/x64/org/lwjgl/{n}", rnd.randbytes(rnd.randint(200_000, 1_500_000)))
+        z.writestr("META-INF/MANIFEST.MF", "Manifest-Version: 1.0\n")
+    rel = "org/lwjgl/lwjgl/3.3.3/lwjgl-3.3.3-natives-linux.jar"
+    h, size = put(f"libs/{rel}", buf.getvalue())
+    libraries.append({"name": "org.lwjgl:lwjgl:3.3.3", "downloads": {"classifiers": {"natives-linux": {"path": rel, "url": f"{base_url}/libs/{rel}", "sha1": h, "size": size}}}})
+
+    jh, jsz = put("client/client.jar", rnd.randbytes(25 * 1024 * 1024))
+    v_json = {
+        "id": VERSION_ID, "type": "release", "mainClass": "net.bench.Main",
+        "javaVersion": {"majorVersion": 21, "component": "java-runtime-delta"},
+        "assetIndex": {"id": "bench", "url": f"{base_url}/indexes/bench.json", "sha1": ih, "size": isz, "totalSize": sum(o["size"] for o in objects.values())},
+        "downloads": {"client": {"url": f"{base_url}/client/client.jar", "sha1": jh, "size": jsz}},
+        "libraries": libraries,
+        "arguments": {"jvm": ["-Djava.library.path=${natives_directory}", "-cp", "${classpath}"],
+                      "game": ["--username", "${auth_player_name}", "--version", "${version_name}", "--gameDir", "${game_directory}",
+                               "--assetsDir", "${assets_root}", "--assetIndex", "${assets_index_name}", "--uuid", "${auth_uuid}"]},
+    }
+    vh, _ = put(f"v/{VERSION_ID}.json", json.dumps(v_json).encode())
+    manifest = {"latest": {"release": VERSION_ID}, "versions": [{"id": VERSION_ID, "type": "release", "url": f"{base_url}/v/{VERSION_ID}.json", "sha1": vh, "releaseTime": "2026-01-01T00:00:00+00:00"}]}
+    put("manifest.json", json.dumps(manifest).encode())
+    return files, total
+
+# STAND-IN SERVER (latency applies to every request, bandwidth & fault injection only to file downloads, never the metadata)
+def make_server(www, latency, bandwidth, error_rate, corrupt_rate, seed):
+    rnd = random.Random(seed)
+    rnd_lock = threading.Lock() # Guards the fault RNG & the counters
+    stats = {"requests": 0, "bytes": 0, "errors": 0, "corrupted": 0}
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True # Headers & body are separate writes, Nagle + delayed ACK would add 40 ms per file
+
+        def log_message(self, *a): pass
+
+        def do_GET(self):
+            path = os.path.normpath(os.path.join(www, self.path.split("?")[0].lstrip("/")))
+            with rnd_lock: stats["requests"] += 1
+            if latency: time.sleep(latency)
+            if not path.startswith(www + os.sep) or not os.path.isfile(path):
+                self.send_error(404)
+                return
+            injected = self.path.startswith(("/res/", "/libs/", "/client/"))
+            with rnd_lock: roll = rnd.random()
+            if injected and roll < error_rate:
+                with rnd_lock: stats["errors"] += 1
+                self.send_error(503)
+                return
+            corrupt = injected and roll < error_rate + corrupt_rate
+            with open(path, "rb") as f: data = f.read()
+            start = 0
+            rng = self.headers.get("Range", "")
+            if rng.startswith("bytes=") and rng[6:].split("-")[0].isdigit():
+                start = int(rng[6:].split("-")[0])
+                if start >= len(data):
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{len(data)}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}")
+            else: self.send_response(200)
+            body = data[start:]
+            if corrupt and body:
+                with rnd_lock: stats["corrupted"] += 1
+                body = bytes([body[0] ^ 0xFF]) + body[1:] # Right size, wrong hash
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            # Per connection bandwidth limit, sent in 64 KiB slices
+            step = 64 * 1024
+            for i in range(0, len(body), step):
+                chunk = body[i:i + step]
+                self.wfile.write(chunk)
+                with rnd_lock: stats["bytes"] += len(chunk)
+                if bandwidth: time.sleep(len(chunk) / bandwidth)
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    return server, stats
+
+# SCENARIOS
+# Modules a warm --last launch must never import, the launcher loads them lazily in the download phases only
+HEAVY_MODULES = ("requests", "urllib3", "tqdm", "aiohttp")
+
+def run_launcher(game_dir, env, extra, stdin="1\n", python_flags=()):
+    cmd = [sys.executable, *python_flags, LAUNCHER, "--game-dir", game_dir, *extra]
+    started = time.perf_counter()
+    p = subprocess.run(cmd, input=stdin, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    return time.perf_counter() - started, p.returncode, p.stdout
+
+def corrupt_files(paths, n, rnd):
+    # Same size, flipped byte: only a real hash check notices
+    picked = rnd.sample(paths, min(n, len(paths)))
+    for p in picked:
+        with open(p, "r+b") as f:
+            b = f.read(1)
+            f.seek(0)
+            f.write(bytes([b[0] ^ 0xFF]))
+    return picked
+
+def main():
+    parser = argparse.ArgumentParser(description=f"  NuxCraft-PyCher | Benchmark suite. | Version: {launcher_version}")
+    parser.add_argument("--objects", type=int, default=4000, metavar="NUMBER", help="  Asset objects to generate | Default: 4000")
+    parser.add_argument("--libraries", type=int, default=100, metavar="NUMBER", help="  Libraries to generate | Default: 100")
+    parser.add_argument("--latency", type=float, default=0.0, metavar="MS", help="  Added latency per request in milliseconds | Default: 0")
+    parser.add_argument("--bandwidth", type=str, default="0", metavar="RATE", help="  Bandwidth per connection in bytes/s (e.g. 20M), 0 = unlimited | Default: 0")
+    parser.add_argument("--error-rate", type=float, default=0.0, metavar="RATIO", help="  Share of file requests answered with HTTP 503 | Default: 0")
+    parser.add_argument("--corrupt-rate", type=float, default=0.0, metavar="RATIO", help="  Share of file responses with a flipped byte | Default: 0")
+    parser.add_argument("--corrupt", type=int, default=25, metavar="NUMBER", help="  Files corrupted on disk for the repair scenarios | Default: 25")
+    parser.add_argument("--runs", type=int, default=5, metavar="NUMBER", help="  Repetitions of the warm --last launch | Default: 5")
+    parser.add_argument("--warm-budget", type=float, default=1.0, metavar="SECONDS", help="  Fail the warm scenario when its median --last launch takes longer, 0 = no limit | Default: 1.0")
+    parser.add_argument("--scenarios", nargs="+", default=["cold", "warm", "repair", "recheck", "legacy", "natives"], choices=["cold", "warm", "repair", "recheck", "legacy", "natives"], help="  Scenarios to run, in order | Default: all")
+    parser.add_argument("--launcher-args", type=str, default="", metavar="FLAGS", help="  Extra launcher flags for every run (e.g. \"--engine async -t 32\")")
+    parser.add_argument("--seed", type=int, default=1, help="  Seed of the synthetic data & injected faults | Default: 1")
+    parser.add_argument("--workdir", type=str, default=None, metavar="PATH", help="  Keep the generated tree & game dir here instead of a temp dir")
+    parser.add_argument("--json", type=str, default=None, metavar="PATH", help="  Also write the results as JSON")
+    parser.add_argument("-v", "--verbose", action="store_true", help="  Print the launcher output of every run")
+    args = parser.parse_args()
+
+    workdir = os.path.abspath(args.workdir) if args.workdir else tempfile.mkdtemp(prefix="nuxcraft-bench-")
+    www, game = os.path.join(workdir, "www"), os.path.join(workdir, "game")
+    rnd = random.Random(args.seed)
+
+    server, stats = make_server(www, args.latency / 1000, parse_size(args.bandwidth), args.error_rate, args.corrupt_rate, args.seed)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        print(f"[ 🧪 ] \033[1;97mGenerating\033[0m {args.objects} objects & {args.libraries} libraries in \033[1;92m{workdir}\033[0m")
+        shutil.rmtree(www, ignore_errors=True)
+        shutil.rmtree(game, ignore_errors=True)
+        n_files, n_bytes = generate_tree(www, base_url, args.objects, args.libraries, args.seed)
+        print(f"[ 🧪 ] \033[1;97mUpstream:\033[0m {n_files} files, {human_bytes(n_bytes)} served from \033[1;92m{base_url}\033[0m")
+
+        # A stand-in java so launches return immediately
+        fake_java = os.path.join(workdir, "java")
+        with open(fake_java, "w") as f: f.write("#!/bin/sh\nexit 0\n")
+        os.chmod(fake_java, 0o755)
+
+        env = dict(os.environ, NUXCRAFT_MANIFEST_URL=f"{base_url}/manifest.json", NUXCRAFT_RESOURCES_URL=f"{base_url}/res")
+        common = ["--java", fake_java, "-R", *args.launcher_args.split()]
+        v_root = os.path.join(game, "versions", VERSION_ID)
+        results = []
+
+        def record(name, seconds, code, out, **extra):
+            served = dict(stats)
+            results.append({"scenario": name, "seconds": round(seconds, 4), "exit": code, "requests": served["requests"], "bytes": served["bytes"], **extra})
+            for k in stats: stats[k] = 0
+            if args.verbose or code != 0: print(out)
+            mark = "✅" if code == 0 else "❌"
+            print(f"[ {mark} ] \033[1;97m{name:<8}\033[0m \033[1;92m{seconds:8.3f} s\033[0m  {served['requests']:6d} requests  {human_bytes(served['bytes']):>10}"
+                  + "".join(f"  {k}={v}" for k, v in extra.items()))
+
+        def installed_objects():
+            root = os.path.join(game, "assets", "objects")
+            return [os.path.join(d, n) for d, _, fs in os.walk(root) for n in fs]
+
+        for scenario in args.scenarios:
+            if scenario != "cold" and not os.path.exists(os.path.join(v_root, ".integrity_passed")):
+                # Every other scenario starts from a complete install
+                run_launcher(game, env, [*common, "--download-only"])
+                for k in stats: stats[k] = 0
+
+            if scenario == "cold":
+                shutil.rmtree(game, ignore_errors=True)
+                record("cold", *run_launcher(game, env, [*common, "--download-only"]), injected_errors=stats["errors"], injected_corrupt=stats["corrupted"])
+
+            elif scenario == "warm":
+                run_launcher(game, env, ["--java", fake_java, "--last"]) # Compiles the launch plan
+                for k in stats: stats[k] = 0
+                times, code, out = [], 0, ""
+                for _ in range(args.runs):
+                    t, c, o = run_launcher(game, env, ["--java", fake_java, "--last"], stdin="")
+                    times.append(t)
+                    code, out = code or c, o
+                # Startup regression guard: the fast path must be taken, stay within budget & keep the heavy modules unloaded
+                _, _, trace = run_launcher(game, env, ["--java", fake_java, "--last"], stdin="", python_flags=("-X", "importtime"))
+                imported = {line.rsplit("|", 1)[1].strip().split(".")[0] for line in trace.splitlines() if line.startswith("import time:") and "|" in line}
+                heavy = sorted(imported.intersection(HEAVY_MODULES))
+                regressions = [f"imports {', '.join(heavy)}"] if heavy else []
+                if "Launch plan ready" not in trace: regressions.append("launch plan not used")
+                if args.warm_budget and statistics.median(times) > args.warm_budget: regressions.append(f"median over {args.warm_budget:g} s")
+                if regressions:
+                    print(f"[ ❌ ] \033[1;91mwarm startup regression:\033[0m {'; '.join(regressions)}")
+                    code = code or 1
+                record("warm", statistics.median(times), code, out, min=round(min(times), 4), runs=args.runs, regressions=len(regressions))
+
+            elif scenario == "repair":
+                # The marker is gone and N objects are damaged: the normal integrity pass + retry loop must fix them
+                corrupt_files(installed_objects(), args.corrupt, rnd)
+                os.remove(os.path.join(v_root, ".integrity_passed"))
+                record("repair", *run_launcher(game, env, [*common, "--download-only"]), corrupted=args.corrupt)
+
+            elif scenario == "recheck":
+                corrupt_files(installed_objects(), args.corrupt, rnd)
+                record("recheck", *run_launcher(game, env, ["--java", fake_java, "--last", "-r", "--repair", *args.launcher_args.split()], stdin=""), corrupted=args.corrupt)
+
+            elif scenario == "legacy":
+                shutil.rmtree(os.path.join(game, "resources"), ignore_errors=True)
+                os.remove(os.path.join(v_root, ".integrity_passed"))
+                record("legacy", *run_launcher(game, env, [*common, "--download-only", "-O"]))
+
+            elif scenario == "natives":
+                shutil.rmtree(os.path.join(game, "natives"), ignore_errors=True)
+                record("natives", *run_launcher(game, env, [*common, "--download-only"]))
+
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump({"objects": args.objects, "libraries": args.libraries, "upstream_bytes": n_bytes, "latency_ms": args.latency,
+                           "bandwidth": args.bandwidth, "error_rate": args.error_rate, "corrupt_rate": args.corrupt_rate,
+                           "launcher_args": args.launcher_args, "results": results}, f, indent=2)
+            print(f"[ 💾 ] \033[1;97mResults written to\033[0m {args.json}")
+        sys.exit(1 if any(r["exit"] != 0 for r in results) else 0)
+    finally:
+        server.shutdown()
+        if not args.workdir: shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\033[1;93mBenchmark interrupted.\033[0m")
+        sys.exit(130)
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
-import argparse, requests, sys, base64, os, json, subprocess
+import argparse, requests, requests.adapters, sys, base64, os, json, subprocess, hashlib, fnmatch, csv
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 ## ⚠️ Disclaimer: This project is for educational, research and testing purposes only.
 
@@ -90,14 +91,95 @@ def interactive_select(options):
             elif key in (b'\r', b'\n'): return options[curr]
             elif key.lower() == b'q': return None
 
-def get_java_major_version(v_json_url, v_id):
+# VERSION INDEX
+# { version id: key metadata of its version JSON } kept in the game dir, so repeated questions need no network at all
+def index_entry(v, v_json, old=None):
+    java = v_json.get('javaVersion', {})
+    return {"type": v['type'], "released": v.get('releaseTime', '')[:10], "sha1": v.get('sha1'),
+            "java": java.get('majorVersion', 8), "component": java.get('component', "jre-legacy"),
+            "assets": v_json.get('assets') or v_json.get('assetIndex', {}).get('id'), "main_class": v_json.get('mainClass'),
+            "libraries": len(v_json.get('libraries', [])), "client_size": v_json.get('downloads', {}).get('client', {}).get('size'),
+            "etag": (old or {}).get('etag'), "last_modified": (old or {}).get('last_modified')}
+
+def load_index(index_path):
     try:
-        response = requests.get(v_json_url, timeout=10)
-        response.raise_for_status() 
-        data = response.json()
-        return data.get('javaVersion', {}).get('majorVersion', "8")
+        with open(index_path, 'r') as f: return json.load(f)
+    except (OSError, ValueError): return {}
+
+def save_index(index, index_path):
+    with open(index_path + ".tmp", 'w') as f: json.dump(index, f)
+    os.replace(index_path + ".tmp", index_path)
+
+def resolve_version(session, v, index, game_dir, offline):
+    # (entry, how) for one manifest entry: the index while the manifest sha1 still matches, the launcher's copy of the JSON, then a conditional request
+    old = index.get(v['id'])
+    if old and (offline or (v.get('sha1') and old.get('sha1') == v['sha1'])): return old, "indexed"
+    local = os.path.join(game_dir, "versions", v['id'], f"{v['id']}.json")
+    if os.path.exists(local):
+        with open(local, 'rb') as f: raw = f.read()
+        if not v.get('sha1') or hashlib.sha1(raw).hexdigest() == v['sha1']: return index_entry(v, json.loads(raw), old), "local"
+    if offline: return None, "missing"
+    headers = {"Accept-Encoding": "gzip"}
+    if old and old.get('etag'): headers["If-None-Match"] = old['etag']
+    if old and old.get('last_modified'): headers["If-Modified-Since"] = old['last_modified']
+    r = session.get(v['url'], headers=headers, timeout=15)
+    if r.status_code == 304: return {**old, "sha1": v.get('sha1')}, "not modified"
+    r.raise_for_status()
+    entry = index_entry(v, r.json())
+    entry["etag"], entry["last_modified"] = r.headers.get('ETag'), r.headers.get('Last-Modified')
+    return entry, "fetched"
+
+def build_index(session, pool, index, index_path, game_dir, threads, offline):
+    # Resolves the whole pool concurrently over the pooled session, returns the ids that couldn't be resolved
+    stats, failed = {}, []
+    with ThreadPoolExecutor(max_workers=threads) as ex, tqdm(total=len(pool), desc="  [ ☕ ] \033[1;94mIndexing\033[0m", unit="ver", leave=False) as bar:
+        futures = {ex.submit(resolve_version, session, v, index, game_dir, offline): v for v in pool}
+        for future in as_completed(futures):
+            v = futures[future]
+            try: entry, how = future.result()
+            except (requests.exceptions.RequestException, ValueError): entry, how = None, "failed"
+            if entry: index[v['id']] = entry
+            else: failed.append(v['id'])
+            stats[how] = stats.get(how, 0) + 1
+            bar.update()
+    save_index(index, index_path)
+    failed.sort(key=[v['id'] for v in pool].index)
+    print(f"  [ ✅ ] Indexed {len(pool) - len(failed)} / {len(pool)} versions ({', '.join(f'{n} {how}' for how, n in sorted(stats.items()))})")
+    return failed
+
+def print_table(pool, index):
+    rows = [(v['id'], index[v['id']]) for v in pool if v['id'] in index]
+    width = max([len("Version")] + [len(vid) for vid, _ in rows])
+    print(f"\n  \033[1;97m{'Version':<{width}}  {'Type':<9}  {'Released':<10}  {'Java':>4}  {'Runtime':<20}  {'Assets':<8}  Libraries\033[0m")
+    for vid, e in rows:
+        print(f"  {vid:<{width}}  \033[1;93m{e['type']:<9}\033[0m  {e['released']:<10}  \033[1;92m{e['java']:>4}\033[0m  {e['component']:<20}  {str(e['assets']):<8}  {e['libraries']}")
+    
+    # The answer to "which JDKs do these versions need"
+    by_java = {}
+    for vid, e in rows: by_java.setdefault(e['java'], []).append(vid)
+    print(f"\n  [ ☕ ] \033[1;97mJDKs needed for these {len(rows)} versions:\033[0m")
+    for java, ids in sorted(by_java.items()):
+        print(f"      \033[1;92mJava {java:<3}\033[0m {len(ids):>4} versions  ({ids[-1]} ... {ids[0]})" if len(ids) > 1 else f"      \033[1;92mJava {java:<3}\033[0m {len(ids):>4} version   ({ids[0]})")
+
+def export_index(pool, index, path):
+    rows = [{"id": v['id'], **{k: val for k, val in index[v['id']].items() if k not in ("etag", "last_modified")}} for v in pool if v['id'] in index]
+    if path.endswith(".csv"):
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ["id"])
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(path, 'w') as f: json.dump(rows, f, indent=2)
+    print(f"  [ ✅ ] Exported {len(rows)} versions to \033[1;92m{path}\033[0m")
+
+def get_java_major_version(session, v, index, index_path, game_dir):
+    try:
+        entry, _ = resolve_version(session, v, index, game_dir, False)
+        index[v['id']] = entry
+        save_index(index, index_path)
+        return entry['java']
     except (requests.exceptions.RequestException, Exception):
-        print(f"  [ ❌ ] \033[1;91mError:\033[0m Cannot fetch required Java version info {v_id}")
+        print(f"  [ ❌ ] \033[1;91mError:\033[0m Cannot fetch required Java version info {v['id']}")
         return "\033[1;91mUnknown (Fetch Error)\033[0m"
 
 def main():
@@ -105,30 +187,57 @@ def main():
     parser.add_argument("-R", "--refresh", action="store_true", dest="refresh", help="  Fetch version list from internet")
     parser.add_argument("-s", "--snapshots", action="store_true", help="  Show snapshot releases")
     parser.add_argument("-b", "--beta", action="store_true", help="  Show old beta releases")
+    parser.add_argument("-a", "--all", action="store_true", dest="all", help="  Index every version of the chosen list and print the Java each needs")
+    parser.add_argument("--versions", nargs="+", metavar="VERSION", help="  Index only these versions (any type, wildcards like 1.20.* work)")
+    parser.add_argument("--offline", action="store_true", help="  Answer from the saved index only, no network")
+    parser.add_argument("--export", metavar="FILE", help="  Also write the table to FILE (.csv or .json)")
+    parser.add_argument("-t", "--threads", type=int, default=16, metavar="NUMBER", help="  Parallel downloads for --all / --versions | Default: 16")
+    parser.add_argument("--game-dir", type=str, metavar="PATH(DIRECTORY FULL_PATH)", default=".game", help="  Game directory of the launcher, its version list cache is shared | Default: .game")
     args = parser.parse_args()
 
-    manifest_cache = "manifest.json"
+    # The version list & the index live in the launcher's cache
+    game_dir = os.path.abspath(args.game_dir)
+    os.makedirs(os.path.join(game_dir, "cache"), exist_ok=True)
+    manifest_cache = os.path.join(game_dir, "cache/manifest.json")
+    index_path = os.path.join(game_dir, "cache/java_index.json")
+    http_meta_path = os.path.join(game_dir, "cache/http_meta.json")
+    if not os.path.exists(manifest_cache) and os.path.exists("manifest.json"): os.replace("manifest.json", manifest_cache) # Older standalone cache
+    
     session = requests.Session()
+    pool_adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=max(10, args.threads))
+    session.mount("https://", pool_adapter)
+    session.mount("http://", pool_adapter)
 
     # Load/Fetch Manifest
     manifest = None
     if args.refresh or not os.path.exists(manifest_cache):
-        manifest_json_remote_source1 = b64d("aHR0cHM6Ly9sYXVuY2hlcm1ldGEubW9qYW5nLmNvbS9tYy9nYW1lL3ZlcnNpb25fbWFuaWZlc3QuanNvbg==")
-        manifest_json_remote_source2 = b64d("aHR0cHM6Ly9waXN0b24tbWV0YS5tb2phbmcuY29tL21jL2dhbWUvdmVyc2lvbl9tYW5pZmVzdC5qc29u")
+        manifest_json_remote_source1 = os.environ.get("NUXCRAFT_MANIFEST_URL") or b64d("aHR0cHM6Ly9sYXVuY2hlcm1ldGEubW9qYW5nLmNvbS9tYy9nYW1lL3ZlcnNpb25fbWFuaWZlc3QuanNvbg==")
+        manifest_json_remote_source2 = os.environ.get("NUXCRAFT_MANIFEST_URL") or b64d("aHR0cHM6Ly9waXN0b24tbWV0YS5tb2phbmcuY29tL21jL2dhbWUvdmVyc2lvbl9tYW5pZmVzdC5qc29u")
+        
+        # Same conditional request bookkeeping as the launcher (cache/http_meta.json)
+        http_meta = load_index(http_meta_path)
+        meta = http_meta.get("cache/manifest.json", {}) if os.path.exists(manifest_cache) else {}
+        headers = {"Accept-Encoding": "gzip"}
+        if meta.get('etag'): headers["If-None-Match"] = meta['etag']
+        if meta.get('last_modified'): headers["If-Modified-Since"] = meta['last_modified']
         try:
             try:
-                r = session.get(manifest_json_remote_source1, timeout=15)
+                r = session.get(manifest_json_remote_source1, headers=headers, timeout=15)
                 r.raise_for_status()
             except requests.exceptions.RequestException:
                 print(f"  [ ❌ ] \033[1;91mError:\033[0m Cannot fetch version list from {manifest_json_remote_source1}")
                 print(f"     Trying {manifest_json_remote_source2}")
-                r = session.get(manifest_json_remote_source2, timeout=15)
+                r = session.get(manifest_json_remote_source2, headers=headers, timeout=15)
                 r.raise_for_status()
             
-            # Extract data FIRST, then save to file
-            manifest = r.json()
-
-            with open(manifest_cache, 'w') as f: json.dump(manifest, f)
+            if r.status_code != 304:
+                # Extract data FIRST, then save to file
+                manifest = r.json()
+                
+                with open(manifest_cache + ".tmp", 'w') as f: json.dump(manifest, f)
+                os.replace(manifest_cache + ".tmp", manifest_cache)
+                http_meta["cache/manifest.json"] = {"etag": r.headers.get('ETag'), "last_modified": r.headers.get('Last-Modified')}
+                save_index(http_meta, http_meta_path)
         except Exception:
             print(f"  [ ❌ ] \033[1;91mCRITICAL:\033[0m Failed to fetch manifest.")
             if os.path.exists(manifest_cache):
@@ -157,6 +266,21 @@ def main():
     if args.beta: types = ['old_beta', 'old_alpha']
     
     v_pool = [v for v in manifest['versions'] if v['type'] in types]
+    index = load_index(index_path)
+
+    # Bulk: index many versions at once, then one table (and export) to answer from
+    if args.all or args.versions:
+        if args.versions: v_pool = [v for v in manifest['versions'] if any(fnmatch.fnmatchcase(v['id'], p) for p in args.versions)]
+        if not v_pool:
+            print("  [ ❌ ] \033[1;91mError:\033[0m No version matches.")
+            sys.exit(1)
+        failed = build_index(session, v_pool, index, index_path, game_dir, max(1, args.threads), args.offline)
+        print_table(v_pool, index)
+        if args.export: export_index(v_pool, index, args.export)
+        if failed:
+            print(f"\n  [ ⚠️ ] \033[1;93mNot indexed{' (not in the saved index)' if args.offline else ''}:\033[0m {' '.join(failed)}")
+            sys.exit(1)
+        sys.exit(0)
 
     # Selection
     selected_obj = interactive_select(v_pool)
@@ -167,7 +291,7 @@ def main():
     print(f"\nSelected: {selected_obj['id']}")
     print(f"Fetching Java requirement...")
     
-    java_v = get_java_major_version(selected_obj['url'], selected_obj['id'])
+    java_v = get_java_major_version(session, selected_obj, index, index_path, game_dir)
     print(f"  [ ☕ ] Required Java Major Version: \033[1;92m{java_v}\033[0m")
 
 if __name__ == "__main__":
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 
-import os, json, requests, subprocess, shutil, zipfile, sys, argparse, hashlib, time, uuid, multiprocessing, tty, termios, base64
-from concurrent.futures import ThreadPoolExecutor
+import os, json, subprocess, sys, argparse, hashlib, time, threading, uuid, base64
+# Networking, progress bar & archive modules are imported lazily by the phases using them, so --last launches never pay for them
 
 ## ⚠️ Disclaimer: This project is for educational, research and testing purposes only.
 
@@ -12,6 +12,8 @@ launcher_version = 0.6
 platform_os = "linux" # If for Linux, then the value should always be "linux" (CASE SENSITIVE).
 ############################
 
+launcher_started = time.perf_counter()
+
 try:
     # Generate player UUID
     def generate_offline_uuid(username):
@@ -24,33 +26,56 @@ try:
         hash_list[8] = (hash_list[8] & 0x3f) | 0x80 
         return str(uuid.UUID(bytes=bytes(hash_list)))
     
-    try:
-        from tqdm import tqdm
-    except ImportError:
-        print("[ ⚠️️ ] \033[1;96mtqdm\033[0m not found. Installing dependencies...")
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "tqdm"])
-        from tqdm import tqdm
+    def tqdm(*a, **kw):
+        # Progress bars only show up once something is downloaded, import (or install) tqdm on first use
+        global tqdm
+        try:
+            from tqdm import tqdm
+        except ImportError:
+            print("[ ⚠️️ ] \033[1;96mtqdm\033[0m not found. Installing dependencies...")
+            subprocess.check_call([sys.executable, "-m", "pip", "install", "tqdm"])
+            from tqdm import tqdm
+        return tqdm(*a, **kw)
     
-    default_max_threads = multiprocessing.cpu_count()
+    default_max_threads = os.cpu_count() or 1
     
     parser = argparse.ArgumentParser(description=f"  NuxCraft-PyCher ({platform_os}) Version: {launcher_version}")
     parser.add_argument("-f", "--fullscreen", action="store_true", help="  Launch the game in fullscreen mode")
-    parser.add_argument("--java", type=str, metavar="PATH(BINARY FULL_PATH)", default="java", help="  Java binary path")
+    parser.add_argument("--java", type=str, metavar="PATH(BINARY FULL_PATH)", default="auto", help="  Java binary path, auto to pick an installed Java matching the game version, list to show the ones found | Default: auto")
     parser.add_argument("--game-dir", type=str, metavar="PATH(DIRECTORY FULL_PATH)", default=".game", help="  Custom game directory | Default: .game")
     parser.add_argument("-O", "--old", action="store_true", dest="old_compatibility", help="  For old version compatibility")
     parser.add_argument("-s", "--snapshots", action="store_true", dest="snapshots", help="  Show snapshot releases")
     parser.add_argument("-b", "--beta", action="store_true", dest="beta", help="  Show old beta releases")
     parser.add_argument("-R", "--refresh", action="store_true", dest="refresh", help="  Fetch version list from internet")
-    # parser.add_argument("-r", "--recheck", action="store_true", dest="recheck", help="  Recheck Files") ## Future Plan
+    parser.add_argument("--revalidate", action="store_true", dest="revalidate", help="  Show the cached version list instantly and refresh it in the background")
+    parser.add_argument("-r", "--recheck", action="store_true", dest="recheck", help="  Re-hash every game file and report corrupt, missing & extra files")
+    parser.add_argument("--repair", action="store_true", dest="repair", help="  With --recheck: re-download corrupt & missing files and remove extra ones")
     parser.add_argument("-p", "--player", type=str, metavar="NAME", default="player", help="  Set player username | Default: player")
-    parser.add_argument("-m", "--memory", type=str, dest="memory", metavar="AMOUNT", default="2G", help="  RAM (e.g. 8G) | Default: 4G")
+    parser.add_argument("-m", "--memory", type=str, dest="memory", metavar="AMOUNT", default="2G", help="  RAM for the game (e.g. 8G), or auto to size it from free memory & the container limit | Default: 2G")
+    parser.add_argument("--allow-swap", action="store_true", dest="allow_swap", help="  Launch even when the heap doesn't fit in free memory (the game may swap or be OOM-killed)")
     parser.add_argument("-t", "--threads", type=int, dest="threads", metavar="NUMBER", default=default_max_threads, help=f"  Allocate max number of threads (e.g. 4) | Default: {default_max_threads}")
+    parser.add_argument("--engine", choices=["threads", "async"], default="threads", help="  Download engine: thread pool or asyncio (needs aiohttp) | Default: threads")
+    parser.add_argument("--connections", type=int, dest="connections", metavar="NUMBER", default=256, help="  Max downloads in flight for the async engine | Default: 256")
+    parser.add_argument("--store", type=str, nargs="?", const=os.path.join(os.environ.get("XDG_DATA_HOME", os.path.expanduser("~/.local/share")), "nuxcraft-pycher/store"), default=None, metavar="PATH(DIRECTORY FULL_PATH)", help="  Share libraries & assets between game dirs through one content-addressed store (files are reflinked or hardlinked: editing one in place edits it in every game dir, changed objects are re-hashed & evicted) | Default PATH: ~/.local/share/nuxcraft-pycher/store")
+    parser.add_argument("--serve", type=int, nargs="?", const=25580, default=None, metavar="PORT", help="  Share this game dir's libraries, assets & versions with --peer launchers on the LAN | Default PORT: 25580")
+    parser.add_argument("--peer", type=str, metavar="URL", default=None, help="  Download from a --serve launcher first (e.g. http://192.168.1.10:25580), upstream is the fallback")
     parser.add_argument("--last", "--offline", action="store_true", dest="offline", help="  Launch last version instantly")
+    parser.add_argument("--supervise", action="store_true", dest="supervise", help="  Stay with the game: rotating compressed game log, RSS / CPU / threads / I/O samples & lag events in logs/sessions")
+    parser.add_argument("--sample-interval", type=float, dest="sample_interval", metavar="SECONDS", default=5.0, help="  How often --supervise samples the game | Default: 5")
+    parser.add_argument("--log-size", type=int, dest="log_size", metavar="MB", default=16, help="  Size of each --supervise game log before it's rotated & gzipped | Default: 16")
+    parser.add_argument("--log-keep", type=int, dest="log_keep", metavar="NUMBER", default=5, help="  Rotated game logs kept per session | Default: 5")
+    parser.add_argument("--jvm-profile", choices=["auto", "low-latency", "throughput", "low-memory", "none"], default="auto", dest="jvm_profile", help="  Garbage collector & JVM thread tuning for the game, sized from --threads | Default: auto")
+    parser.add_argument("--cds", action="store_true", dest="cds", help="  Keep a class data sharing (AppCDS) archive per version & Java to start the game faster (Java 13+)")
     parser.add_argument("--jvm-flags", type=str, metavar="FLAGS", default=" ", help="  Parse extra flags/arguments for JVM when launching game")
     parser.add_argument("--game-flags", type=str, metavar="FLAGS", default=" ", help="  Parse extra flags/arguments for the game when launching game")
     parser.add_argument("--no-openal", action="store_true", dest="force_disable_openal", help="  Force disable use of openal if possible")
     parser.add_argument("--openal", action="store_true", dest="force_openal", help="  Use of openal if possible")
     parser.add_argument("--dhp", "--disable-huge-pages", action="store_true", dest="disable_huge_pages", help="  Disable Huge Pages")
+    parser.add_argument("--prefetch", nargs="+", metavar="VERSION", default=None, help="  Download many versions in one shared run without launching. Globs match the listed type (-s/-b), e.g. '1.20*' or '*'")
+    parser.add_argument("--since", type=str, metavar="VERSION|DATE", default=None, help="  With --prefetch: only versions released since VERSION or a date (e.g. 1.16, 2026-10)")
+    parser.add_argument("--timings", action="store_true", dest="timings", help="  Print a per-phase timing table at exit (always saved to logs/phases.json)")
+    parser.add_argument("--trace", type=str, nargs="?", const="", default=None, metavar="PATH", help="  Export the phases as a Chrome trace / Perfetto JSON | Default PATH: logs/trace.json")
+    parser.add_argument("--profile", action="store_true", dest="profile", help="  Run under cProfile, saved to logs/profile.prof")
     parser.add_argument("--download-only", action="store_true", dest="game_download_only", help="  Only Download game files.")
     parser.add_argument("--demo", "--demo-mode", action="store_true", dest="demo_mode", help="  Launch the game in demo mode")
     
@@ -66,7 +91,11 @@ try:
         print(f"[ ❌ ] \033[1;91mError:\033[0m Invalid thread count specified: {args.threads}. Must be a positive integer.")
         sys.exit(1)
     
-    args.threads = min(args.threads, multiprocessing.cpu_count())
+    args.threads = min(args.threads, default_max_threads)
+    
+    if args.connections <= 0:
+        print(f"[ ❌ ] \033[1;91mError:\033[0m Invalid connection count specified: {args.connections}. Must be a positive integer.")
+        sys.exit(1)
     
     # Useful vars (all of them generated on the fly) [better not to edit them]
     USERNAME = args.player
@@ -78,39 +107,1004 @@ try:
     JVM_ARGS = args.jvm_flags
     GAME_ARGS = args.game_flags
     DEMO_MODE = args.demo_mode
+    STORE_DIR = os.path.abspath(args.store) if args.store else None
     
     # Simple thing... You know but do not say...
     b64d = lambda dta: base64.b64decode(dta).decode('utf-8')
     
+    # JSON LAYER: orjson if installed (several times faster & leaner on manifests, asset indexes and the verification cache), else the standard library
+    try:
+        import orjson
+        json_loads, json_dumps = orjson.loads, orjson.dumps
+    except ImportError:
+        json_loads, json_dumps = json.loads, lambda obj: json.dumps(obj, separators=(',', ':')).encode()
+    
+    def read_json(path):
+        with open(path, 'rb') as f: return json_loads(f.read())
+    
     for folder in ['versions', 'libraries', 'assets/indexes', 'assets/objects', 'resources', 'cache', 'logs']:
         os.makedirs(os.path.join(MC_DIR, folder), exist_ok=True)
+    if STORE_DIR: os.makedirs(os.path.join(STORE_DIR, "objects"), exist_ok=True)
+    
+    # PHASE TIMING: the run is a sequence of phases, entering one closes the previous. Reported to logs/ at exit.
+    # bytes_hashed only counts bytes read back from disk to hash them, downloads are hashed as they stream in (bytes_moved)
+    phase_counters = {"files": 0, "bytes_moved": 0, "bytes_hashed": 0, "cache_hits": 0, "retries": 0}
+    phase_lock = threading.Lock()
+    phases = [{"name": "startup", "start": 0.0, **{f"_{k}": 0 for k in phase_counters}}]
+    
+    def count(key, n=1):
+        with phase_lock: phase_counters[key] += n
+    
+    def enter_phase(name):
+        now = time.perf_counter() - launcher_started
+        with phase_lock:
+            last = phases[-1]
+            if "seconds" not in last:
+                last["seconds"] = now - last["start"]
+                for k, v in phase_counters.items(): last[k] = v - last.pop(f"_{k}")
+            if name: phases.append({"name": name, "start": now, **{f"_{k}": v for k, v in phase_counters.items()}})
+    
+    def human_bytes(n):
+        for unit in ("B", "KiB", "MiB", "GiB"):
+            if n < 1024 or unit == "GiB": return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+            n /= 1024
+    
+    def write_phase_report():
+        # logs/phases.json (latest run) + logs/phases_history.jsonl (one line per launch / download run) to compare machines & releases
+        enter_phase(None)
+        total = time.perf_counter() - launcher_started
+        report = {"launcher_version": launcher_version, "version": globals().get("VERSION"), "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                  "python": sys.version.split()[0], "machine": os.uname().machine, "cpus": os.cpu_count(), "engine": args.engine, "threads": args.threads,
+                  "total_seconds": round(total, 4), "phases": [{**p, "start": round(p["start"], 4), "seconds": round(p["seconds"], 4)} for p in phases]}
+        try:
+            with open(os.path.join(MC_DIR, "logs/phases.json"), 'w') as f: json.dump(report, f, indent=2)
+            if len(phases) > 1: # Launch & download runs only, not --serve / --java list
+                history = os.path.join(MC_DIR, "logs/phases_history.jsonl")
+                with open(history, 'a') as f: f.write(json.dumps(report, separators=(',', ':')) + "\n")
+                if os.path.getsize(history) > 2 * 1048576: # Bounded: past 2 MiB only the last 1000 runs are kept
+                    with open(history, 'r') as f: keep = f.readlines()[-1000:]
+                    with open(history + ".tmp", 'w') as f: f.writelines(keep)
+                    os.replace(history + ".tmp", history)
+            if args.trace is not None:
+                # Chrome trace / Perfetto (ui.perfetto.dev, chrome://tracing): one complete event per phase
+                events = [{"name": p["name"], "ph": "X", "pid": os.getpid(), "tid": 1, "ts": int(p["start"] * 1e6), "dur": int(p["seconds"] * 1e6),
+                           "args": {k: p[k] for k in phase_counters}} for p in phases]
+                with open(args.trace or os.path.join(MC_DIR, "logs/trace.json"), 'w') as f: json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        except OSError: pass # Reporting never fails the run
+        if args.timings:
+            print(f"\n  \033[1;97m{'Phase':<22}{'Time':>10}{'Files':>8}{'Moved':>12}{'Hashed':>12}{'Cache hits':>12}{'Retries':>9}\033[0m")
+            for p in phases:
+                print(f"  {p['name']:<22}{p['seconds'] * 1000:>8.1f}ms{p['files']:>8}{human_bytes(p['bytes_moved']):>12}{human_bytes(p['bytes_hashed']):>12}{p['cache_hits']:>12}{p['retries']:>9}")
+            print(f"  \033[1;97m{'total':<22}{total * 1000:>8.1f}ms\033[0m\n")
+        if profiler:
+            # Only the main thread is profiled, worker threads show up as time spent waiting on their futures
+            import pstats
+            profiler.disable()
+            profiler.dump_stats(os.path.join(MC_DIR, "logs/profile.prof"))
+            print(f"[ 🔬 ] \033[1;97mProfile written to\033[0m {os.path.join(MC_DIR, 'logs/profile.prof')}")
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+    
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    import atexit
+    atexit.register(write_phase_report)
+    
+    # LAN PEER SERVER (--serve): share this game dir's files with --peer launchers, then never launch
+    def serve_peer(port):
+        import http.server, socket, urllib.parse
+        shared = ("libraries/", "assets/objects/", "assets/indexes/")
+        
+        def shareable(rel):
+            # Libraries, asset objects & indexes, and of versions/ only <id>/<id>.json & <id>.jar (launch plans hold the player name, UUID & local paths)
+            parts = rel.split("/")
+            if parts[0] == "versions": return len(parts) == 3 and parts[2] in (f"{parts[1]}.json", f"{parts[1]}.jar")
+            return (rel + "/").startswith(shared)
+    
+        class PeerHandler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1" # Keep-alive, a client pulls thousands of files over a few connections
+            disable_nagle_algorithm = True # Headers & body are separate writes, Nagle + delayed ACK would add 40 ms per file
+    
+            def log_message(self, *a): pass
+    
+            def do_HEAD(self): self.do_GET(body=False)
+    
+            def do_GET(self, body=True):
+                rel = os.path.normpath(urllib.parse.unquote(urllib.parse.urlsplit(self.path).path).lstrip("/"))
+                path = os.path.join(MC_DIR, rel)
+                # Only finished files below the shared folders, never a .part or anything outside the game dir
+                if not shareable(rel) or rel.startswith("..") or rel.endswith((".part", ".tmp")) or not os.path.isfile(path):
+                    self.send_error(404)
+                    return
+                with open(path, 'rb') as f:
+                    size = os.fstat(f.fileno()).st_size
+                    start, end = 0, size - 1
+                    rng = self.headers.get("Range", "")
+                    if rng.startswith("bytes=") and "," not in rng:
+                        a, _, b = rng[6:].strip().partition("-")
+                        try:
+                            if a: start, end = int(a), min(int(b), size - 1) if b else size - 1
+                            else: start = max(0, size - int(b))
+                        except ValueError: start, end = 0, size - 1
+                        if start >= size or start > end:
+                            self.send_response(416)
+                            self.send_header("Content-Range", f"bytes */{size}")
+                            self.send_header("Content-Length", "0")
+                            self.end_headers()
+                            return
+                        self.send_response(206)
+                        self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+                    else: self.send_response(200)
+                    self.send_header("Content-Type", "application/octet-stream")
+                    self.send_header("Content-Length", str(end - start + 1))
+                    self.send_header("Accept-Ranges", "bytes")
+                    self.end_headers()
+                    if body and end >= start:
+                        self.wfile.flush()
+                        self.connection.sendfile(f, start, end - start + 1) # Zero-copy from the page cache
+                served["files"] += 1
+                served["bytes"] += max(0, end - start + 1) if body else 0
+    
+        served = {"files": 0, "bytes": 0}
+        server = http.server.ThreadingHTTPServer(("", port), PeerHandler)
+        server.daemon_threads = True
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+                s.connect(("10.255.255.255", 1)) # No packet is sent, this only picks the LAN interface
+                host = s.getsockname()[0]
+        except OSError: host = "127.0.0.1"
+        print(f"[ 📡 ] \033[1;97mServing\033[0m \033[1;92m{MC_DIR}\033[0m \033[1;97mto the LAN on\033[0m \033[1;92mhttp://{host}:{port}\033[0m")
+        print(f"[ 📡 ] \033[1;97mOn the other machines run:\033[0m \033[1;96m{os.path.basename(sys.argv[0])} --peer http://{host}:{port}\033[0m (Ctrl+C to stop)")
+        try: server.serve_forever()
+        finally:
+            server.server_close()
+            print(f"\n[ 📡 ] \033[1;97mServed\033[0m {served['files']} files ({served['bytes'] / 1048576:.1f} MiB)")
+    
+    if args.serve: serve_peer(args.serve)
+    
+    # JAVA RUNTIMES: every java binary is probed once per JDK (real path + mtime) & the result cached
+    java_runtimes_path = os.path.join(MC_DIR, "cache/java_runtimes.json")
+    
+    def java_runtime_key(java_bin):
+        import shutil
+        try:
+            real = os.path.realpath(shutil.which(java_bin) or java_bin)
+            return f"{real}:{os.stat(real).st_mtime_ns}", real
+        except OSError: return None, None
+    
+    def load_java_runtimes():
+        try: return read_json(java_runtimes_path)
+        except (OSError, ValueError): return {}
+    
+    def save_java_runtimes(runtimes):
+        with open(java_runtimes_path + ".tmp", 'wb') as f: f.write(json_dumps(runtimes))
+        os.replace(java_runtimes_path + ".tmp", java_runtimes_path)
+    
+    def run_java_probe(real):
+        # One JVM start, -XshowSettings:properties prints everything on stderr (major is None when it isn't a working java)
+        try: out = subprocess.run([real, "-XshowSettings:properties", "-version"], capture_output=True, text=True, timeout=20).stderr
+        except (OSError, subprocess.SubprocessError): out = ""
+        props = dict(l.strip().split(" = ", 1) for l in out.splitlines() if " = " in l)
+        spec = props.get("java.specification.version", "")
+        spec = spec[2:] if spec.startswith("1.") else spec # 1.8 -> 8
+        return {"major": int(spec) if spec.isdigit() else None, "version": props.get("java.version", ""), "vendor": props.get("java.vendor", ""),
+                "arch": props.get("os.arch", ""), "home": props.get("java.home", ""), "flags": {}}
+    
+    def probe_runtimes(java_bins):
+        # { real path: info } of java binaries, only the ones not seen before are started (in parallel)
+        runtimes = load_java_runtimes()
+        keys = {}
+        for java_bin in java_bins:
+            key, real = java_runtime_key(java_bin)
+            if key: keys[real] = key
+        missing = [real for real, key in keys.items() if key not in runtimes]
+        if missing:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(8, len(missing))) as ex:
+                for real, info in zip(missing, ex.map(run_java_probe, missing)): runtimes[keys[real]] = info
+            # Forget binaries that were replaced (new mtime) or uninstalled
+            for key in list(runtimes):
+                real = key.rsplit(":", 1)[0]
+                if (real in keys and keys[real] != key) or not os.path.exists(real): del runtimes[key]
+            save_java_runtimes(runtimes)
+        return {real: runtimes[key] for real, key in keys.items()}
+    
+    def probe_java(java_bin):
+        # { "major", "version", "vendor", "arch", "home", "flags" } of one java binary, None if it doesn't exist
+        return next(iter(probe_runtimes([java_bin]).values()), None)
+    
+    def java_accepts(java_bin, flags):
+        # True if the JVM starts with these flags, cached per JDK & flag set
+        key, real = java_runtime_key(java_bin)
+        if not key: return False
+        runtimes = load_java_runtimes()
+        flags_key = hashlib.sha1("\n".join(flags).encode()).hexdigest()
+        known = runtimes.get(key, {}).get("flags", {})
+        if flags_key in known: return known[flags_key]
+        try: ok = subprocess.run([real, *flags, "-version"], capture_output=True, timeout=30).returncode == 0
+        except (OSError, subprocess.SubprocessError): return False
+        runtimes = load_java_runtimes()
+        runtimes.setdefault(key, run_java_probe(real)).setdefault("flags", {})[flags_key] = ok
+        save_java_runtimes(runtimes)
+        return ok
+    
+    def discover_java():
+        # Real paths of every java in the usual JDK install locations, the game dir, JAVA_HOME & PATH
+        import glob
+        home = os.path.expanduser("~")
+        found = [os.path.join(os.environ["JAVA_HOME"], "bin/java")] if os.environ.get("JAVA_HOME") else []
+        found += [os.path.join(d, "java") for d in os.environ.get("PATH", "").split(os.pathsep) if d]
+        for pattern in (f"{MC_DIR}/runtime/*", "/usr/lib/jvm/*", "/usr/lib64/jvm/*", "/usr/java/*", "/opt/java/*", "/opt/*jdk*", "/opt/*jre*",
+                        f"{home}/.sdkman/candidates/java/*", f"{home}/.jdks/*", f"{home}/.gradle/jdks/*", f"{home}/.asdf/installs/java/*", f"{home}/.local/share/jdks/*"):
+            found += [os.path.join(d, "bin/java") for d in sorted(glob.glob(pattern))]
+        runtimes = []
+        for path in found:
+            if os.path.isfile(path) and os.access(path, os.X_OK) and os.path.realpath(path) not in runtimes: runtimes.append(os.path.realpath(path))
+        return runtimes
+    
+    def match_java(required, runtimes):
+        # (real path, info) for a game needing Java `required`: native arch, then the same major, then the closest newer one & its latest update
+        arch = {"x86_64": "amd64", "i686": "x86", "i386": "x86"}.get(os.uname().machine, os.uname().machine)
+        def rank(item):
+            info = item[1]
+            update = tuple(-int(n) for n in "".join(c if c.isdigit() else " " for c in info.get("version", "")).split())
+            return (info.get("arch", "") not in (arch, ""), info["major"] != required, info["major"], update)
+        usable = [item for item in runtimes.items() if item[1].get("major") and item[1]["major"] >= required]
+        return min(usable, key=rank) if usable else (None, None)
+    
+    def list_java_runtimes():
+        runtimes = probe_runtimes(discover_java())
+        print(f"[ ☕ ] \033[1;97mJava runtimes found:\033[0m {len(runtimes)}")
+        for real, info in sorted(runtimes.items(), key=lambda item: -(item[1].get("major") or 0)):
+            if info.get("major"): print(f"      \033[1;92mJava {info['major']:<3}\033[0m {info['version']:<14} {info['vendor'][:24]:<24} {info['arch']:<8} {real}")
+            else: print(f"      \033[1;91mbroken  \033[0m {'':<48} {real}")
+        sys.exit(0)
+    
+    if args.java == "list": list_java_runtimes()
+    
+    # MEMORY PLANNER
+    # What the game may really use: RAM, the container (cgroup) limit, reserved hugetlbfs pages & the THP mode, all in MiB
+    def read_meminfo():
+        info = {}
+        try:
+            with open("/proc/meminfo") as f:
+                for line in f:
+                    key, value = line.split(":", 1)
+                    value = value.split()
+                    info[key] = int(value[0]) // 1024 if value[1:] == ["kB"] else int(value[0]) # HugePages_* are page counts
+        except (OSError, ValueError, IndexError): pass
+        return info
+    
+    def cgroup_memory():
+        # (limit, in use without reclaimable page cache) of the tightest memory cgroup above us, (None, None) when unlimited
+        try:
+            with open("/proc/self/cgroup") as f: entries = [line.rstrip("\n").split(":", 2) for line in f]
+        except OSError: return None, None
+        limit = used = None
+        for hierarchy, controllers, cg_path in entries:
+            if hierarchy == "0": base, limit_file, usage_file, cache_key = "/sys/fs/cgroup", "memory.max", "memory.current", "inactive_file" # v2
+            elif "memory" in controllers.split(","): base, limit_file, usage_file, cache_key = "/sys/fs/cgroup/memory", "memory.limit_in_bytes", "memory.usage_in_bytes", "total_inactive_file" # v1
+            else: continue
+            d = base + cg_path.rstrip("/")
+            while True:
+                try:
+                    with open(os.path.join(d, limit_file)) as f: value = f.read().strip()
+                    if value != "max" and int(value) < 1 << 50 and (limit is None or int(value) >> 20 < limit):
+                        with open(os.path.join(d, usage_file)) as f: usage = int(f.read())
+                        with open(os.path.join(d, "memory.stat")) as f: stat = dict(line.split() for line in f)
+                        limit, used = int(value) >> 20, max(0, usage - int(stat.get(cache_key, 0))) >> 20
+                except (OSError, ValueError): pass
+                if d == base: break
+                d = os.path.dirname(d)
+        return limit, used
+    
+    def thp_mode():
+        try:
+            with open("/sys/kernel/mm/transparent_hugepage/enabled") as f: status = f.read()
+            return status[status.index("[") + 1:status.index("]")]
+        except (OSError, ValueError): return None
+    
+    def jvm_overhead_mb(heap_mb):
+        # Metaspace, code cache, GC bookkeeping, thread stacks & the native side of the game (LWJGL, GL driver, OpenAL)
+        return 640 + heap_mb // 8
+    
+    def memory_budget():
+        mem = read_meminfo()
+        cg_limit, cg_used = cgroup_memory()
+        total, available, limited_by = mem.get("MemTotal", 0), mem.get("MemAvailable", mem.get("MemTotal", 0)), "RAM"
+        if cg_limit is not None and cg_limit < total:
+            total, available, limited_by = cg_limit, min(available, cg_limit - cg_used), "cgroup"
+        return {"total": total, "available": available, "limited_by": limited_by, "swap": mem.get("SwapTotal", 0),
+                "hugetlb_total": mem.get("HugePages_Total", 0) * mem.get("Hugepagesize", 2),
+                "hugetlb_free": mem.get("HugePages_Free", 0) * mem.get("Hugepagesize", 2), "hugetlb_page": mem.get("Hugepagesize", 2)}
+    
+    def recommended_heap_mb(budget):
+        # Largest heap whose whole footprint stays within 85% of what's free, 1-8 GiB in 256 MiB steps
+        heap = int((budget["available"] * 0.85 - 640) / 1.125)
+        return max(1024, min(8192, heap // 256 * 256))
+    
+    def guard_memory(heap_mb):
+        # Refuse a heap that can't fit: past the limit the kernel OOM-kills the game, past what's free it swaps
+        budget = memory_budget()
+        if not budget["total"] or args.allow_swap: return
+        footprint = heap_mb + jvm_overhead_mb(heap_mb)
+        if footprint <= budget["available"]: return
+        fate = "would be OOM-killed" if footprint > budget["total"] or not budget["swap"] else "would swap"
+        print(f"[ ❌ ] \033[1;91mError:\033[0m A {heap_mb}M heap (~{footprint}M with the JVM) {fate}: "
+              f"{budget['available']}M of {budget['total']}M ({budget['limited_by']}) is available.\n"
+              f"       Use \033[1;96m-m {recommended_heap_mb(budget)}M\033[0m (or \033[1;96m-m auto\033[0m), or \033[1;96m--allow-swap\033[0m to launch anyway.")
+        sys.exit(1)
+    
+    # SUPERVISED MODE (--supervise): the launcher stays with the game, keeps its output in a bounded log & samples it from /proc
+    # Notable game log lines, the key is what gets counted in the session summary
+    game_events = {
+        "cant_keep_up": r"Can't keep up!.*?(\d+)ms or (\d+) ticks behind",
+        "gc_overhead": r"GC overhead limit exceeded",
+        "out_of_memory": r"OutOfMemoryError",
+        "gc_pause": r"\[gc\s*\].*Pause.*?(\d+\.\d+)ms$", # -Xlog:gc lines, only pauses of 100 ms+ are flagged
+        "crash": r"Crash Report ----|Game crashed!",
+    }
+    
+    def session_log(path):
+        # Game output through a size-bounded log, full files are gzipped away (game.log.1.gz is the newest)
+        import logging, logging.handlers, gzip, shutil
+        def gzip_rotate(source, dest):
+            with open(source, 'rb') as src, gzip.open(dest, 'wb') as out: shutil.copyfileobj(src, out)
+            os.remove(source)
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=args.log_size * 1048576, backupCount=args.log_keep, encoding="utf-8")
+        handler.namer, handler.rotator = (lambda name: name + ".gz"), gzip_rotate
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        log = logging.getLogger("nuxcraft.game")
+        log.propagate = False
+        log.addHandler(handler)
+        log.setLevel(logging.INFO)
+        return log
+    
+    def read_proc(pid):
+        # (cpu seconds, rss bytes, threads, major faults, read bytes, written bytes) of a process, I/O is None if /proc/<pid>/io is unreadable
+        with open(f"/proc/{pid}/stat") as f: stat = f.read().rsplit(")", 1)[1].split()
+        io = {}
+        try:
+            with open(f"/proc/{pid}/io") as f: io = dict(line.split(": ") for line in f.read().splitlines())
+        except OSError: pass
+        # Fields after "(comm)": 0 state, 9 majflt, 11 utime, 12 stime, 17 num_threads, 21 rss (pages)
+        return ((int(stat[11]) + int(stat[12])) / os.sysconf("SC_CLK_TCK"), int(stat[21]) * os.sysconf("SC_PAGE_SIZE"), int(stat[17]), int(stat[9]),
+                int(io["read_bytes"]) if io else None, int(io["write_bytes"]) if io else None)
+    
+    def sample_game(pid, samples_path, stop, summary):
+        # Compact time series: one header object, then [seconds, rss MiB, cpu %, threads, major faults, read KiB, written KiB] per interval
+        started = last_t = time.monotonic()
+        try: last = read_proc(pid)
+        except (OSError, IndexError, ValueError): return # Exited before the first sample
+        with open(samples_path, 'w') as f:
+            f.write(json.dumps({"pid": pid, "interval": args.sample_interval, "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                                "columns": ["t", "rss_mib", "cpu_pct", "threads", "majflt", "read_kib", "write_kib"]}) + "\n")
+            while not stop.wait(args.sample_interval):
+                try: now = read_proc(pid)
+                except (OSError, IndexError, ValueError): break # The game is gone
+                t = time.monotonic()
+                cpu = (now[0] - last[0]) / (t - last_t) * 100
+                row = [round(t - started, 1), round(now[1] / 1048576, 1), round(cpu, 1), now[2], now[3] - last[3],
+                       (now[4] - last[4]) // 1024 if now[4] is not None else None, (now[5] - last[5]) // 1024 if now[5] is not None else None]
+                f.write(json.dumps(row, separators=(",", ":")) + "\n")
+                f.flush()
+                summary["samples"] += 1
+                summary["peak_rss_mib"] = max(summary["peak_rss_mib"], row[1])
+                summary["peak_threads"] = max(summary["peak_threads"], now[2])
+                summary["cpu_seconds"], summary["major_faults"] = round(now[0], 1), summary["major_faults"] + row[4]
+                if now[4] is not None: summary["read_mib"], summary["write_mib"] = round(now[4] / 1048576, 1), round(now[5] / 1048576, 1)
+                last, last_t = now, t
+    
+    def supervise_game(final_cmd, log_header):
+        import re, signal, shutil
+        sessions_dir = os.path.join(MC_DIR, "logs/sessions")
+        # Named by the second, a counter keeps two sessions started within the same second apart
+        os.makedirs(sessions_dir, exist_ok=True)
+        stamp, n = time.strftime("%Y%m%d-%H%M%S"), 0
+        while True:
+            session_dir = os.path.join(sessions_dir, stamp + (f"-{n}" if n else ""))
+            try:
+                os.mkdir(session_dir)
+                break
+            except FileExistsError: n += 1
+        for old in sorted(os.listdir(sessions_dir))[:-20]: shutil.rmtree(os.path.join(sessions_dir, old), ignore_errors=True) # Keep the last 20 sessions
+        
+        # GC pauses go to the game output as well (Java 9+ unified logging) so they line up with the game's own lines
+        java_major = (probe_java(final_cmd[0]) or {}).get("major") or 0
+        cmd = [final_cmd[0], "-Xlog:gc:stdout:uptime,tags", *final_cmd[1:]] if java_major >= 9 else final_cmd
+        log = session_log(os.path.join(session_dir, "game.log"))
+        log.info(log_header)
+        patterns = {name: re.compile(p) for name, p in game_events.items()}
+        summary = {"version": VERSION, "session": os.path.basename(session_dir), "samples": 0, "peak_rss_mib": 0, "peak_threads": 0,
+                   "cpu_seconds": 0, "major_faults": 0, "read_mib": None, "write_mib": None, "events": {name: 0 for name in game_events}}
+        
+        proc = subprocess.Popen(cmd, cwd=MC_DIR, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, start_new_session=True)
+        started = time.monotonic()
+        stop = threading.Event()
+        sampler = threading.Thread(target=sample_game, args=(proc.pid, os.path.join(session_dir, "samples.jsonl"), stop, summary), daemon=True)
+        sampler.start()
+        print(f"[ ✅ ] \033[1;97mGame running under supervision\033[0m (pid {proc.pid}, sampling every {args.sample_interval:g}s)")
+        print(f"[ 📁 ] \033[1;97mSession:\033[0m \033[1;92m{os.path.relpath(session_dir, MC_DIR)}\033[0m | Ctrl+C stops the game\n")
+        
+        with open(os.path.join(session_dir, "events.jsonl"), 'w') as events:
+            try:
+                for raw in proc.stdout:
+                    line = raw.decode("utf-8", "replace").rstrip("\r\n")
+                    log.info(line)
+                    for name, pattern in patterns.items():
+                        if not (m := pattern.search(line)): continue
+                        if name == "gc_pause" and float(m.group(1)) < 100: break
+                        at = time.monotonic() - started
+                        summary["events"][name] += 1
+                        events.write(json.dumps({"t": round(at, 1), "event": name, "line": line[-300:]}) + "\n")
+                        events.flush()
+                        print(f"[ ⚠️ ] \033[1;93m{time.strftime('%H:%M:%S', time.gmtime(at))} {name.replace('_', ' ')}:\033[0m {line[-160:]}")
+                        break
+            except KeyboardInterrupt:
+                print("\n[ 🛑 ] \033[1;97mStopping the game...\033[0m")
+                proc.send_signal(signal.SIGTERM) # The JVM shutdown hooks still save the world
+                for raw in proc.stdout: log.info(raw.decode("utf-8", "replace").rstrip("\r\n"))
+        
+        code, summary["duration_s"] = proc.wait(), round(time.monotonic() - started, 1)
+        # Killed by signal N (Popen reports -N) exits 128+N like a shell would, sys.exit() can't take a negative code
+        summary["exit_code"], summary["signal"] = (128 - code, signal.Signals(-code).name) if code < 0 else (code, None)
+        stop.set()
+        sampler.join()
+        log.info("#" * 25 + f" GAME EXITED ({summary['exit_code']}) " + "#" * 25)
+        with open(os.path.join(session_dir, "summary.json"), 'w') as f: json.dump(summary, f, indent=2)
+        flagged = ", ".join(f"{n} {name.replace('_', ' ')}" for name, n in summary["events"].items() if n) or "no notable events"
+        print(f"\n[ 📊 ] \033[1;97mSession:\033[0m {time.strftime('%H:%M:%S', time.gmtime(summary['duration_s']))}, exit code {summary['exit_code']}{f" ({summary['signal']})" if summary['signal'] else ''}, "
+              f"peak RSS {summary['peak_rss_mib']:.0f} MiB, {summary['peak_threads']} threads, {summary['cpu_seconds']:.0f} CPU s, {flagged}")
+        sys.exit(summary["exit_code"])
+    
+    # GAME LAUNCH
+    def launch_game(final_cmd, huge_pages_active, intentionally_disabled_huge_pages, v_mjvn):
+        enter_phase("launch")
+        heap_mb = next(int(a[4:-1]) for a in final_cmd if a.startswith("-Xmx"))
+        guard_memory(heap_mb)
+        if huge_pages_active:
+            print(f"\n[ ✅ ] \033[1;92m{huge_pages_active} enabled\033[0m")
+        else:
+            if intentionally_disabled_huge_pages:
+                print("\n[ ℹ️ ] \033[1;96mHuge pages\033[1;97m have been disabled by the user\033[0m.")
+            else:
+                print("\n[ ℹ️ ] \033[1;97mNOTE: \033[1;96mTransparent Huge Pages (THP)\033[1;97m not detected or disabled.\033[0m\n", 
+                      "      \033[1;97mFor optimal performance, consider enabling \033[1;96mTransparent Huge Pages (THP)\033[1;97m on your system (\033[1;96mOptional\033[1;97m).\033[0m")
+        
+        print(f"\n[ 👍 ] Finalizing... \n", 
+              f"        🎮 \033[1;97mGame Version:\033[0m \033[1;92m{VERSION}\033[0m\n", 
+              f"        👩 \033[1;97mPlayer Name:\033[0m \033[1;92m{USERNAME}\033[0m\n", 
+              f"        🎚️ \033[1;97mMax Allocated RAM:\033[0m \033[1;92m{heap_mb}M\033[0m\n", 
+              f"        📈 \033[1;97mMax Thread Count:\033[0m \033[1;92m{MAX_THREAD_COUNT}\033[0m\n", 
+              f"        ☕ \033[1;97mRequired major Java Version:\033[0m \033[1;92m{v_mjvn}\033[0m\n"
+              )
+        
+        if DEMO_MODE: print(f"\n    [ ⚠️ ] \033[1;93mWARNING:\033[0m DEMO MODE enabled...\n", 
+                            f"    \033[1;97mYES, YOU did it... INTENTIONALLY!!!\033[0m\n", 
+                            f"    Have a nice \033[1;97m1 Hour 40 Minutes\033[0m DEMO!!!\n"
+                            )
+        
+        log_header = f"    (PLATFORM: {platform_os}) COMMAND EXECUTED:\n\n{' '.join(final_cmd)}\n\n" + "#" * 25 + " GAME OUTPUT START " + "#" * 25 + "\n"
+        if args.supervise: supervise_game(final_cmd, log_header)
+        
+        with open(os.path.join(MC_DIR, "logs/latest_launch.log"), "w") as f:
+            f.write(log_header + "\n")
+            f.flush()
+            
+            # Detach and exit
+            subprocess.Popen(
+                final_cmd, 
+                cwd=MC_DIR, 
+                stdout=f, 
+                stderr=f, 
+                start_new_session=True
+            )
+            
+            print("[ ✅ ] \033[1;97mGame launch started.\033[0m")
+            print("[ ⏰ ] \033[1;97mPlease, be patient...\033[0m\n")
+            sys.exit(0)
+    
+    # LAUNCH PLAN
+    # Launch options that can't change the game command line (menu & download only)
+    non_launch_options = {"snapshots", "beta", "refresh", "revalidate", "engine", "connections", "store", "offline", "game_download_only", "recheck", "repair", "serve", "peer", "prefetch", "since", "timings", "trace", "profile", "allow_swap", "supervise", "sample_interval", "log_size", "log_keep"}
+    
+    def launch_plan_key(v_json_raw):
+        # Invalidated by the version JSON, the game dir, the launch options, the THP mode and the launcher itself
+        opts = {k: v for k, v in sorted(vars(args).items()) if k not in non_launch_options}
+        cds = sorted(os.listdir(os.path.join(MC_DIR, "cache/cds", VERSION))) if args.cds and os.path.isdir(os.path.join(MC_DIR, "cache/cds", VERSION)) else [] # Trained archive appeared
+        budget = memory_budget() # -m auto & the large page mode follow the memory limit & the reserved huge pages
+        return hashlib.sha1(v_json_raw + json.dumps([launcher_version, os.stat(__file__).st_mtime_ns, MC_DIR, opts, thp_mode(), budget["total"], budget["hugetlb_total"], cds]).encode()).hexdigest()
+    
+    # SELECT GAME VERSION
+    last_v_file = os.path.join(MC_DIR, "cache/last_version.txt")
+    manifest_cache = os.path.join(MC_DIR, "cache/manifest.json")
+    VERSION, V_URL = None, None
+    
+    if args.offline and os.path.exists(last_v_file):
+        with open(last_v_file, 'r') as f: VERSION = f.read().strip()
+        print(f"[ ✅ ] Local Authentication Active: Loading {VERSION}")
+        
+        # Fast path: replay the compiled launch plan, no version JSON traversal at all
+        enter_phase("launch plan")
+        launch_plan_path = os.path.join(MC_DIR, f"versions/{VERSION}/launch_plan.json")
+        try:
+            plan = read_json(launch_plan_path)
+            with open(os.path.join(MC_DIR, f"versions/{VERSION}/{VERSION}.json"), 'rb') as f: v_json_raw = f.read()
+            if not args.recheck and plan['key'] == launch_plan_key(v_json_raw) and os.path.exists(os.path.join(plan['natives_dir'], ".complete")) \
+               and (args.java != "auto" or os.path.exists(plan['argv'][0])):
+                print(f"[ ⚡ ] \033[1;97mLaunch plan ready in\033[0m \033[1;92m{(time.perf_counter() - launcher_started) * 1000:.1f} ms\033[0m")
+                launch_game(plan['argv'], *plan['huge_pages'], plan['java_major'])
+        except (OSError, ValueError, KeyError): pass # No usable plan, take the normal path
     
     # UTILITIES
-    session = requests.Session()
-    session.headers.update({"User-Agent": f"NuxCraft-PyCher/{launcher_version} ({platform_os})"})
+    session = None
+    session_lock = threading.Lock()
+    
+    def net():
+        # The shared HTTP session, requests is imported on first use
+        global requests, session
+        with session_lock:
+            if session is None:
+                import requests, requests.adapters
+                session = requests.Session()
+                session.headers.update({"User-Agent": f"NuxCraft-PyCher/{launcher_version} ({platform_os})"})
+                # The default adapter keeps only 10 connections per host, size it to the thread pool so workers don't drop & reopen them
+                pool_adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=max(10, MAX_THREAD_COUNT))
+                session.mount("https://", pool_adapter)
+                session.mount("http://", pool_adapter)
+        return session
+    
+    # VERIFICATION CACHE
+    # { relative path: [size, mtime_ns, inode, verified sha1] } so unchanged files are never re-read
+    verify_cache_path = os.path.join(MC_DIR, "cache/verified.json")
+    verify_cache = {}
+    if os.path.exists(verify_cache_path):
+        try:
+            verify_cache = read_json(verify_cache_path)
+        except (OSError, ValueError): verify_cache = {} # Corrupt cache only costs a re-hash
+    
+    # The store keeps its own { sha1: [size, mtime_ns, inode, sha1] } next to the objects, shared by every game dir using it,
+    # so a new game dir links verified objects in without hashing the whole store again
+    store_cache_path = os.path.join(STORE_DIR, "verified.json") if STORE_DIR else None
+    store_cache, store_evicted = {}, set()
+    if store_cache_path and os.path.exists(store_cache_path):
+        try:
+            store_cache = read_json(store_cache_path)
+        except (OSError, ValueError): store_cache = {}
+    
+    def save_verify_cache():
+        tmp = verify_cache_path + ".tmp"
+        with open(tmp, 'wb') as f: f.write(json_dumps(verify_cache))
+        os.replace(tmp, verify_cache_path)
+        if not store_cache_path: return
+        # Other game dirs may have verified objects meanwhile, merge with what is on disk instead of overwriting it
+        try: merged = read_json(store_cache_path)
+        except (OSError, ValueError): merged = {}
+        merged.update(store_cache)
+        for h in store_evicted: merged.pop(h, None)
+        tmp = f"{store_cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, 'wb') as f: f.write(json_dumps(merged))
+            os.replace(tmp, store_cache_path)
+        except OSError: pass # Read-only store, objects are only re-hashed next time
+    
+    def file_sha1(path):
+        # One update over an mmap of the whole file, hashlib drops the GIL for it so hashing threads scale
+        import mmap
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0: return hashlib.sha1().hexdigest()
+            count("bytes_hashed", size)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m: return hashlib.sha1(m).hexdigest()
+    
+    def record_verified(path, expected_hash):
+        st = os.stat(path)
+        verify_cache[os.path.relpath(path, MC_DIR)] = [st.st_size, st.st_mtime_ns, st.st_ino, expected_hash]
+    
+    def verify(path, expected_hash, expected_size=None):
+        if not expected_hash: return False
+        try: st = os.stat(path)
+        except OSError: return False
+        if st.st_size == 0: return False # Treat empty files as invalid
+        if expected_size is not None and st.st_size != expected_size: return False # Wrong size, no need to hash
+        key = os.path.relpath(path, MC_DIR)
+        if verify_cache.get(key) == [st.st_size, st.st_mtime_ns, st.st_ino, expected_hash]:
+            count("cache_hits")
+            return True
+        if file_sha1(path) != expected_hash:
+            verify_cache.pop(key, None)
+            return False
+        verify_cache[key] = [st.st_size, st.st_mtime_ns, st.st_ino, expected_hash]
+        return True
     
-    def get(url, path, expected_hash=None, silent=False):
+    # SHARED OBJECT STORE
+    def reflink(src, dst):
+        # Copy-on-write clone (btrfs, xfs, ...), raises OSError where the filesystem can't do it
+        import fcntl
+        with open(src, 'rb') as s, open(dst, 'wb') as d:
+            try: fcntl.ioctl(d.fileno(), 0x40049409, s.fileno()) # FICLONE
+            except OSError:
+                os.remove(dst)
+                raise
+    
+    def link_or_copy(src, dst, copy=True):
+        # Materialize src at dst as a reflink, hardlink, or (last resort, unless copy=False) a plain copy. Atomic for readers of dst.
+        tmp = f"{dst}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try: reflink(src, tmp)
+        except OSError:
+            try: os.link(src, tmp)
+            except OSError:
+                if not copy: raise
+                import shutil
+                shutil.copy2(src, tmp)
+        os.replace(tmp, dst)
+    
+    def store_path(expected_hash):
+        return os.path.join(STORE_DIR, "objects", expected_hash[:2], expected_hash)
+    
+    def store_object_ok(src, expected_hash, expected_size=None):
+        # Store objects are hardlinked into every game dir, so a write to any copy lands in the store as well.
+        # An object is re-hashed whenever its (size, mtime, inode) differs from when it was last verified, and evicted if it doesn't match.
+        try: st = os.stat(src)
+        except OSError: return False
+        if st.st_size == 0 or (expected_size is not None and st.st_size != expected_size): ok = False
+        elif store_cache.get(expected_hash) == [st.st_size, st.st_mtime_ns, st.st_ino, expected_hash]: return True
+        else: ok = file_sha1(src) == expected_hash
+        if ok:
+            store_cache[expected_hash] = [st.st_size, st.st_mtime_ns, st.st_ino, expected_hash]
+            store_evicted.discard(expected_hash)
+        else:
+            store_cache.pop(expected_hash, None)
+            store_evicted.add(expected_hash)
+            try: os.remove(src)
+            except OSError: pass
+        return ok
+    
+    def store_fetch(path, expected_hash, expected_size=None):
+        # Fill path from the store, only with an object that still matches its hash
+        if not STORE_DIR or not expected_hash: return False
+        src = store_path(expected_hash)
+        if not store_object_ok(src, expected_hash, expected_size): return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try: link_or_copy(src, path)
+        except OSError: return False
+        record_verified(path, expected_hash)
+        count("cache_hits")
+        return True
+    
+    def store_adopt(path, expected_hash):
+        # Publish a verified file into the store so the next game dir doesn't download it again, replacing a damaged object
+        if not STORE_DIR or not expected_hash: return
+        dst = store_path(expected_hash)
+        try:
+            if os.path.exists(dst) and not os.path.samefile(path, dst):
+                if store_object_ok(dst, expected_hash): return
+            if not os.path.exists(dst):
+                os.makedirs(os.path.dirname(dst), exist_ok=True)
+                link_or_copy(path, dst)
+            # path was just verified, so is the object it is (or was copied to)
+            st = os.stat(dst)
+            store_cache[expected_hash] = [st.st_size, st.st_mtime_ns, st.st_ino, expected_hash]
+            store_evicted.discard(expected_hash)
+        except OSError: pass # The store is an optimization, never fail a download because of it
+    
+    def have_file(path, expected_hash, expected_size=None):
+        # True if path already holds the expected file, resolving through the store first
+        if STORE_DIR and expected_hash and not os.path.exists(path):
+            return store_fetch(path, expected_hash, expected_size)
+        if verify(path, expected_hash, expected_size):
+            store_adopt(path, expected_hash)
+            return True
+        return store_fetch(path, expected_hash, expected_size)
+    
+    def publish(part, path, expected_hash, expected_size, digest=None):
+        # Validate a finished .part file, then fsync & rename it into place. Returns None or why it was rejected.
+        # digest is the SHA-1 computed while streaming, so the file doesn't have to be read back.
+        size = os.path.getsize(part)
+        if expected_size is not None and size < expected_size: return f"incomplete ({size} of {expected_size} bytes)" # Kept, resumes next try
+        if expected_size is not None and size > expected_size: reason = f"size mismatch ({size} != {expected_size} bytes)"
+        elif size == 0: reason = "empty file"
+        elif expected_hash and (digest or file_sha1(part)) != expected_hash: reason = "hash mismatch"
+        else: reason = None
+        if reason:
+            os.remove(part) # Corrupt, start over from byte 0
+            return reason
+        fd = os.open(part, os.O_RDONLY)
+        try: os.fsync(fd)
+        finally: os.close(fd)
+        os.replace(part, path)
+        if expected_hash:
+            record_verified(path, expected_hash)
+            store_adopt(path, expected_hash)
+        return None
+    
+    def part_hasher(part, offset):
+        # SHA-1 of what a resumed .part already holds, new chunks are hashed as they stream in
+        sha1 = hashlib.sha1()
+        if offset:
+            count("bytes_hashed", offset)
+            with open(part, 'rb') as f:
+                while chunk := f.read(1024*1024): sha1.update(chunk)
+        return sha1
+    
+    def resume_offset(part, expected_size):
+        # How much of a previous attempt can be reused (0 = start over)
+        try: offset = os.path.getsize(part)
+        except OSError: return 0
+        if expected_size is not None and offset > expected_size:
+            os.remove(part)
+            return 0
+        return offset
+    
+    # TRANSFER STATS (bytes pulled from the network, used for the download ETA)
+    transfer_lock = threading.Lock()
+    transfer = {"bytes": 0}
+    
+    def count_bytes(n):
+        with transfer_lock: transfer["bytes"] += n
+        count("bytes_moved", n)
+    
+    # LAN PEER (--peer): files with a known hash are tried on a --serve launcher first, upstream is the fallback
+    peer = {"url": args.peer.rstrip("/") if args.peer else None}
+    
+    def peer_url(path, expected_hash):
+        # None when there is no (working) peer or nothing to check its answer against
+        if not peer["url"] or not expected_hash: return None
+        from urllib.parse import quote
+        return f"{peer['url']}/{quote(os.path.relpath(path, MC_DIR).replace(os.sep, '/'))}"
+    
+    def peer_failed(path, reason):
+        # A peer that can't be reached is dropped for the rest of the run, a missing file (HTTP 404) only skips that file.
+        # Whatever the peer left behind is discarded, upstream never resumes a .part of unknown origin.
+        try: os.remove(path + ".part")
+        except OSError: pass
+        if reason not in ("timeout", "connection error"): return
+        with session_lock:
+            if not peer["url"]: return
+            peer["url"] = None
+            print(f"[ ⚠️ ] \033[1;93mWarning:\033[0m LAN peer unreachable ({reason}), downloading from upstream only.")
+    
+    def get(url, path, expected_hash=None, expected_size=None, silent=False):
+        # Returns None once the file is in place, otherwise the failure reason (HTTP status, timeout, hash mismatch...)
+        if args.offline: return
+        if have_file(path, expected_hash, expected_size): return
+        if src := peer_url(path, expected_hash):
+            if not (reason := transfer_file(src, path, expected_hash, expected_size, True)): return
+            peer_failed(path, reason)
+        return transfer_file(url, path, expected_hash, expected_size, silent)
+    
+    def transfer_file(url, path, expected_hash, expected_size, silent):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        part = path + ".part" # Never write the final path directly, an interrupted download stays a .part
+        offset = resume_offset(part, expected_size)
+        sha1 = None
+        try:
+            if expected_size is None or offset < expected_size:
+                with net().get(url, timeout=15, stream=True, headers={"Range": f"bytes={offset}-"} if offset else None) as r:
+                    if r.status_code == 416: os.remove(part) # Stale .part, the next attempt starts from 0
+                    r.raise_for_status()
+                    if r.status_code != 206: offset = 0 # Server ignored the Range, rewrite from the start
+                    sha1 = part_hasher(part, offset)
+                    total = offset + int(r.headers.get('content-length', 0))
+                    with open(part, 'ab' if offset else 'wb') as f, tqdm(total=total, initial=offset, unit='B', unit_scale=True, 
+                        unit_divisor=1024, desc=f"  [ ☕ ] \033[1;94mSyncing {os.path.basename(path)}\033[0m", disable=silent, bar_format="{desc}: \033[1;92m{percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt}\033[0m \033[1;97m[{rate_fmt}]\033[0m  ") as bar:
+                        for chunk in r.iter_content(chunk_size=1024*1024):
+                            if chunk: f.write(chunk); sha1.update(chunk); bar.update(len(chunk)); count_bytes(len(chunk))
+        except requests.exceptions.HTTPError as e: reason = f"HTTP {e.response.status_code}"
+        except requests.exceptions.Timeout: reason = "timeout"
+        except requests.exceptions.ConnectionError: reason = "connection error"
+        except Exception as e: reason = str(e) or type(e).__name__
+        else: reason = publish(part, path, expected_hash, expected_size, sha1 and sha1.hexdigest())
+        if reason and not silent: print(f"[ ! ] \033[1;91mError:\033[0m {os.path.basename(path)}: {reason}")
+        return reason
+    
+    async def aget(client, url, path, expected_hash=None, expected_size=None):
+        # asyncio twin of get() (always silent), used by the async engine
         if args.offline: return
-        def verify():
-            if not expected_hash or not os.path.exists(path): return False
-            if os.path.getsize(path) == 0: return False # Treat empty files as invalid
-            sha1 = hashlib.sha1()
-            with open(path, 'rb') as f:
-                while chunk := f.read(8192): sha1.update(chunk)
-            return sha1.hexdigest() == expected_hash
-    
-        if verify(): return
+        loop = asyncio.get_running_loop()
+        if await loop.run_in_executor(None, have_file, path, expected_hash, expected_size): return # Hash off the event loop
+        if src := peer_url(path, expected_hash):
+            if not (reason := await atransfer_file(client, src, path, expected_hash, expected_size)): return
+            peer_failed(path, reason)
+        return await atransfer_file(client, url, path, expected_hash, expected_size)
+    
+    async def atransfer_file(client, url, path, expected_hash, expected_size):
+        loop = asyncio.get_running_loop()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        part = path + ".part"
+        offset = resume_offset(part, expected_size)
+        sha1 = None
+        try:
+            if expected_size is None or offset < expected_size:
+                async with client.get(url, headers={"Range": f"bytes={offset}-"} if offset else None) as r:
+                    if r.status == 416: os.remove(part)
+                    r.raise_for_status()
+                    if r.status != 206: offset = 0
+                    sha1 = await loop.run_in_executor(None, part_hasher, part, offset)
+                    with open(part, 'ab' if offset else 'wb') as f:
+                        async for chunk in r.content.iter_chunked(1024*1024):
+                            if chunk: f.write(chunk); sha1.update(chunk); count_bytes(len(chunk))
+        except aiohttp.ClientResponseError as e: return f"HTTP {e.status}"
+        except asyncio.TimeoutError: return "timeout"
+        except aiohttp.ClientError: return "connection error"
+        except Exception as e: return str(e) or type(e).__name__
+        return await loop.run_in_executor(None, publish, part, path, expected_hash, expected_size, sha1 and sha1.hexdigest())
+    
+    def load_async_engine():
+        # aiohttp is only needed for --engine async
+        global aiohttp, asyncio
+        import asyncio
+        try:
+            import aiohttp
+        except ImportError:
+            print("[ ⚠️️ ] \033[1;96maiohttp\033[0m not found. Installing dependencies...")
+            try:
+                subprocess.check_call([sys.executable, "-m", "pip", "install", "aiohttp"])
+                import aiohttp
+            except Exception:
+                print("[ ⚠️ ] \033[1;93mWarning:\033[0m Could not install aiohttp. Falling back to \033[1;96mthreads\033[0m engine.")
+                return False
+        return True
+    
+    # CONDITIONAL FETCH (manifest, version JSON, asset index)
+    # { relative path: {"etag": ..., "last_modified": ...} } of the cached copy
+    http_meta_path = os.path.join(MC_DIR, "cache/http_meta.json")
+    http_meta_lock = threading.Lock()
+    http_meta = {}
+    if os.path.exists(http_meta_path):
+        try:
+            http_meta = read_json(http_meta_path)
+        except (OSError, ValueError): http_meta = {}
+    
+    def fetch_conditional(url, path, expected_hash=None, expected_size=None):
+        # Fetch a document only if it changed upstream (ETag / Last-Modified), gzip on the wire.
+        # Returns True if path got new content, False if the cached copy is still current. Raises on failure.
+        net() # Also imports requests for the callers' except clauses
+        if expected_hash and have_file(path, expected_hash, expected_size): return False
+        if src := peer_url(path, expected_hash):
+            if not (reason := transfer_file(src, path, expected_hash, expected_size, True)): return True
+            peer_failed(path, reason)
+        key = os.path.relpath(path, MC_DIR)
+        headers = {"Accept-Encoding": "gzip"}
+        meta = http_meta.get(key, {}) if os.path.exists(path) and not expected_hash else {}
+        if meta.get('etag'): headers["If-None-Match"] = meta['etag']
+        if meta.get('last_modified'): headers["If-Modified-Since"] = meta['last_modified']
+        r = net().get(url, headers=headers, timeout=15)
+        count("files")
+        if r.status_code == 304:
+            count("cache_hits")
+            return False
+        r.raise_for_status()
+        count_bytes(len(r.content))
         os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".part", 'wb') as f: f.write(r.content)
+        if reason := publish(path + ".part", path, expected_hash, expected_size, hashlib.sha1(r.content).hexdigest()):
+            raise requests.exceptions.ContentDecodingError(f"{os.path.basename(path)}: {reason}")
+        with http_meta_lock:
+            http_meta[key] = {"etag": r.headers.get('ETag'), "last_modified": r.headers.get('Last-Modified')}
+            with open(http_meta_path + ".tmp", 'w') as f: json.dump(http_meta, f)
+            os.replace(http_meta_path + ".tmp", http_meta_path)
+        return True
+    
+    def entry_size(queue, i):
+        return queue.size(i) if isinstance(queue, AssetQueue) else queue[i][3] or 0
+    
+    def interleave_by_size(queue):
+        # Queue indices, biggest files start first so they never end up as the last stragglers, small ones fill the gaps in between
+        ordered = sorted(range(len(queue)), key=lambda i: entry_size(queue, i), reverse=True)
+        out, i, j = [], 0, len(ordered) - 1
+        while i <= j:
+            out.append(ordered[i]); i += 1
+            if i <= j: out.append(ordered[j]); j -= 1
+        return out
+    
+    def already_verified(path, expected_hash, expected_size=None):
+        # Stat-only check (verification cache or store hit), never hashes
+        try: st = os.stat(path)
+        except OSError: st = None
+        if st and verify_cache.get(os.path.relpath(path, MC_DIR)) == [st.st_size, st.st_mtime_ns, st.st_ino, expected_hash]: return True
+        if not (STORE_DIR and expected_hash): return False
+        entry = store_cache.get(expected_hash)
+        if st and entry == [st.st_size, st.st_mtime_ns, st.st_ino, expected_hash]: return True # Hardlinked, the file is the store object
+        try: st = os.stat(store_path(expected_hash))
+        except OSError: return False
+        return entry == [st.st_size, st.st_mtime_ns, st.st_ino, expected_hash]
+    
+    throughput_path = os.path.join(MC_DIR, "cache/throughput.json")
+    
+    def report_download_plan(queues):
+        # Byte totals & ETA (from the throughput measured on previous runs) before anything is downloaded
+        total = sum(entry_size(q, i) for q in queues for i in range(len(q)))
+        remaining = sum(entry_size(q, i) for q in queues for i in range(len(q)) if not already_verified(*q[i][1:]))
+        eta = "unknown (no previous download measured)"
+        try:
+            bps = read_json(throughput_path)['bytes_per_sec']
+            eta = f"~{remaining / bps:.0f} s at {human_bytes(bps)}/s"
+        except (OSError, ValueError, KeyError, ZeroDivisionError): pass
+        print(f"[ 📦 ] \033[1;97mDownload plan:\033[0m \033[1;94m{sum(len(q) for q in queues)}\033[0m files, \033[1;94m{human_bytes(total)}\033[0m total, \033[1;94m{human_bytes(remaining)}\033[0m remaining | ETA: \033[1;94m{eta}\033[0m")
+    
+    def record_throughput(nbytes, seconds):
+        # Smoothed over runs, only meaningful transfers count
+        if nbytes < 1024*1024 or seconds <= 0: return
+        bps = nbytes / seconds
         try:
-            with session.get(url, timeout=15, stream=True) as r:
-                r.raise_for_status()
-                total = int(r.headers.get('content-length', 0))
-                with open(path, 'wb') as f, tqdm(total=total, unit='B', unit_scale=True, 
-                    unit_divisor=1024, desc=f"  [ ☕ ] \033[1;94mSyncing {os.path.basename(path)}\033[0m", disable=silent, bar_format="{desc}: \033[1;92m{percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt}\033[0m \033[1;97m[{rate_fmt}]\033[0m  ") as bar:
-                    for chunk in r.iter_content(chunk_size=1024*1024):
-                        if chunk: f.write(chunk); bar.update(len(chunk))
-        except Exception as e:
-            if not silent: print(f"[ ! ] \033[1;91mError:\033[0m {e}")
+            bps = 0.5 * bps + 0.5 * read_json(throughput_path)['bytes_per_sec']
+        except (OSError, ValueError, KeyError): pass
+        with open(throughput_path, 'w') as f: json.dump({"bytes_per_sec": bps}, f)
+    
+    def download_all(queue, desc):
+        # Download & verify every (url, path, hash, size) entry of the queue (a list or an AssetQueue) with the selected engine.
+        # Returns [(entry, reason), ...] for the entries that are still not in place.
+        if not queue: return []
+        order = interleave_by_size(queue)
+        count("files", len(queue))
+        bar = tqdm(total=sum(entry_size(queue, i) for i in order), unit='B', unit_scale=True, unit_divisor=1024, desc=desc, bar_format="{desc}: \033[1;92m{percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt} \033[0m \033[1;97m[{rate_fmt}, ETA {remaining}]\033[0m  ")
+        failed = []
+        if args.engine == "async":
+            async def run():
+                # One keep-alive pool for the whole run, bounded overall & per host
+                connector = aiohttp.TCPConnector(limit=args.connections, limit_per_host=args.connections, ttl_dns_cache=300, keepalive_timeout=30)
+                timeout = aiohttp.ClientTimeout(total=None, sock_connect=15, sock_read=15)
+                async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=dict(net().headers)) as client:
+                    async def job(i): return i, await aget(client, *queue[i])
+                    for j in asyncio.as_completed([job(i) for i in order]):
+                        i, reason = await j
+                        if reason: failed.append((queue[i], reason))
+                        bar.update(entry_size(queue, i))
+            asyncio.run(run())
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=args.threads) as ex:
+                for i, reason in ex.map(lambda i: (i, get(*queue[i], silent=True)), order):
+                    if reason: failed.append((queue[i], reason))
+                    bar.update(entry_size(queue, i))
+        bar.close()
+        save_verify_cache()
+        return failed
+    
+    def download_with_repair(stages, max_retries=7):
+        # Download every (phase name, queue, desc) stage, returns the repair queue of what never made it (empty on success).
+        # First pass goes over everything, after that only the failed files are repaired
+        print(f"\n[ \033[1;95m1\033[0m 🎯 ] \033[1;97mDownload/Verification Attempt:\033[0m ( \033[1;95m1\033[0m / \033[1;95m{max_retries}\033[0m )")
+        report_download_plan([queue for _, queue, _ in stages])
+        started, transfer["bytes"], failed = time.time(), 0, []
+        for name, queue, desc in stages:
+            enter_phase(name)
+            failed += download_all(queue, desc)
+        record_throughput(transfer["bytes"], time.time() - started)
+    
+        # REPAIR QUEUE: { path: [entry, last reason, attempts, next try] } with per file exponential backoff
+        repair = {x[1]: [x, reason, 1, time.time() + 1] for x, reason in failed}
+        while repair:
+            print(f"[ ⚠️ ] \033[1;93mWarning:\033[0m {len(repair)} file/s failed to download or are corrupt:")
+            for x, reason, attempts, _ in list(repair.values())[:15]: # Log first 15 failed files to stdout
+                print(f" - {os.path.basename(x[1])}: \033[1;91m{reason}\033[0m (attempt {attempts}/{max_retries})")
+            if len(repair) > 15: print(f" ... and {len(repair)-15} more.")
+    
+            retryable = [r for r in repair.values() if r[2] < max_retries]
+            if not retryable: break
+            wait = max(0, min(r[3] for r in retryable) - time.time())
+            print(f"[ ⚠️ ] \033[1;93mRetrying failed files in {wait:.0f} seconds...\033[0m")
+            time.sleep(wait)
+    
+            due = [r for r in retryable if r[3] <= time.time()]
+            enter_phase("repair")
+            count("retries", len(due))
+            print(f"\n[ \033[1;95m{max(r[2] for r in due)+1}\033[0m 🎯 ] \033[1;97mRepair Attempt:\033[0m {len(due)} file/s")
+            still_failed = dict((x[1], reason) for x, reason in download_all([r[0] for r in due], "  [ 🔧 ] \033[1;94mRepairing Files\033[0m"))
+            for r in due:
+                path = r[0][1]
+                if path not in still_failed:
+                    del repair[path]
+                    continue
+                r[1], r[2] = still_failed[path], r[2] + 1
+                r[3] = time.time() + min(30, 2 ** (r[2] - 1))
+    
+        return repair
+    
+    if args.engine == "async" and not load_async_engine(): args.engine = "threads"
     
     def is_allowed(rules):
         # Strict Linux filtering for libraries.
@@ -122,40 +1116,227 @@ try:
             if match: allowed = (r['action'] == 'allow')
         return allowed
     
-    # SELECT GAME VERSION
-    last_v_file = os.path.join(MC_DIR, "cache/last_version.txt")
-    manifest_cache = os.path.join(MC_DIR, "cache/manifest.json")
-    VERSION, V_URL = None, None
+    def parse_version(v_json, jar_path):
+        # (lib_queue, cp_paths, natives_queue) of a version JSON, lib_queue starts with the client jar
+        client = v_json['downloads']['client']
+        cp_paths, lib_queue, natives_queue = [jar_path], [(client['url'], jar_path, client.get('sha1'), client.get('size'))], []
     
-    if args.offline and os.path.exists(last_v_file):
-        with open(last_v_file, 'r') as f: VERSION = f.read().strip()
-        print(f"[ ✅ ] Local Authentication Active: Loading {VERSION}")
+        # Parse Libraries (for Linux)
+        for lib in v_json['libraries']:
+            if not is_allowed(lib.get('rules')): continue
+            dl = lib.get('downloads', {})
+            if 'artifact' in dl:
+                lp = os.path.join(MC_DIR, "libraries", dl['artifact']['path'])
+                lib_queue.append((dl['artifact']['url'], lp, dl['artifact'].get('sha1'), dl['artifact'].get('size')))
+                cp_paths.append(lp)
+                # ATTENTION NEEDED!!! (For linux only) libflite.so ships inside the text2speech library
+                if "text2speech" in lp: natives_queue.append((lp, dl['artifact'].get('sha1'), 'libflite.so'))
+            # Explicitly look for Linux natives
+            if f"natives-{platform_os}" in dl.get('classifiers', {}):
+                n_data = dl['classifiers'][f"natives-{platform_os}"]
+                np = os.path.join(MC_DIR, "libraries", n_data['path'])
+                lib_queue.append((n_data['url'], np, n_data.get('sha1'), n_data.get('size')))
+                natives_queue.append((np, n_data.get('sha1'), '.so'))
+        return lib_queue, cp_paths, natives_queue
+    
+    # ASSET INDEXES are parsed once into parallel arrays (names, hashes, sizes), the per entry dicts are dropped right away.
+    # The same arrays feed the download queue, the verification & (-O) the legacy resources.
+    def load_asset_index(index_path):
+        from array import array
+        objs = read_json(index_path).get('objects', {})
+        names, hashes, sizes = list(objs), [d['hash'] for d in objs.values()], array('q', [d.get('size', -1) for d in objs.values()])
+        del objs
+        return names, hashes, sizes
+    
+    class AssetQueue:
+        # Download queue of distinct asset objects kept as (hashes, sizes) arrays: queue[i] builds the (url, path, hash, size)
+        # entry only when its job runs, so the URL & path strings of thousands of objects never exist all at once
+        res_link = os.environ.get("NUXCRAFT_RESOURCES_URL") or b64d("aHR0cHM6Ly9yZXNvdXJjZXMuZG93bmxvYWQubWluZWNyYWZ0Lm5ldA==")
+        objects_dir = os.path.join(MC_DIR, "assets/objects")
+    
+        def __init__(self, objects):
+            # objects: { hash: size (-1 if unknown) }
+            from array import array
+            self.hashes, self.sizes = list(objects), array('q', objects.values())
+    
+        def __len__(self): return len(self.hashes)
+    
+        def __getitem__(self, i):
+            h, size = self.hashes[i], self.sizes[i]
+            return (f"{self.res_link}/{h[:2]}/{h}", f"{self.objects_dir}/{h[:2]}/{h}", h, None if size < 0 else size)
+    
+        def size(self, i): return max(0, self.sizes[i])
+    
+    def asset_queue(index):
+        # AssetQueue of a loaded index with one entry per distinct object (names sharing an object are downloaded once)
+        _, hashes, sizes = index
+        return AssetQueue(dict(zip(hashes, sizes)))
+    
+    def reconstruct_legacy_resources(names, hashes):
+        # Old versions read assets by name from resources/, link every mapped name to its object
+        res_dir = os.path.join(MC_DIR, "resources")
+        state_path = os.path.join(res_dir, ".legacy_map.json") # { name: hash } already materialized
+        state = {}
+        if os.path.exists(state_path):
+            try:
+                state = read_json(state_path)
+            except (OSError, ValueError): state = {}
+    
+        # Unchanged entries are skipped straight from the state file, without touching the disk
+        todo = [(name, h) for name, h in zip(names, hashes) if state.get(name) != h]
+        if not todo: return
+        enter_phase("legacy sounds")
+        count("files", len(todo))
+        needs_copy = []
+        for name, h in tqdm(todo, desc="[ 🔊 ] \033[1;94mReconstructing Legacy Sounds\033[0m", bar_format="{desc}: \033[1;92m{percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt}\033[0m items  "):
+            src_file = os.path.join(MC_DIR, f"assets/objects/{h[:2]}/{h}")
+            dst_file = os.path.join(res_dir, name)
+            if not os.path.exists(src_file): continue
+            os.makedirs(os.path.dirname(dst_file), exist_ok=True)
+            try:
+                link_or_copy(src_file, dst_file, copy=False)
+                state[name] = h
+            except OSError: needs_copy.append((name, h, src_file, dst_file))
+    
+        # Linking failed (e.g. resources/ on another filesystem), copy what's left in parallel
+        if needs_copy:
+            from concurrent.futures import ThreadPoolExecutor
+            def copy_one(x):
+                link_or_copy(x[2], x[3])
+                return x
+            with ThreadPoolExecutor(max_workers=args.threads) as ex:
+                for name, h, _, _ in ex.map(copy_one, needs_copy): state[name] = h
+        with open(state_path, 'wb') as f: f.write(json_dumps(state))
+    
+    def refresh_manifest(silent=False):
+        # Conditional fetch from the first reachable source, True if the cached manifest changed
+        # NUXCRAFT_MANIFEST_URL / NUXCRAFT_RESOURCES_URL point the launcher at a mirror (or the benchmark.py stand-in server)
+        manifest_json_remote_source1 = os.environ.get("NUXCRAFT_MANIFEST_URL") or b64d('aHR0cHM6Ly9sYXVuY2hlcm1ldGEubW9qYW5nLmNvbS9tYy9nYW1lL3ZlcnNpb25fbWFuaWZlc3QuanNvbg==')
+        manifest_json_remote_source2 = os.environ.get("NUXCRAFT_MANIFEST_URL") or b64d('aHR0cHM6Ly9waXN0b24tbWV0YS5tb2phbmcuY29tL21jL2dhbWUvdmVyc2lvbl9tYW5pZmVzdC5qc29u')
+        try:
+            return fetch_conditional(manifest_json_remote_source1, manifest_cache)
+        except requests.exceptions.RequestException:
+            if not silent:
+                print(f"[ ❌ ] Cannot fetch version list from {manifest_json_remote_source1}")
+                print(f"     Trying {manifest_json_remote_source2}")
+            return fetch_conditional(manifest_json_remote_source2, manifest_cache)
+    
+    # BATCH PREFETCH (--prefetch): resolve many versions up front, then download their shared files in one run
+    def select_versions(manifest, patterns, types, since=None):
+        # Exact ids match any type, globs only the listed types. since is a version id or an ISO date (2024, 2024-06, 2024-06-01)
+        from fnmatch import fnmatchcase
+        import re
+        versions = manifest['versions']
+        picked = [v for v in versions if any(v['id'] == p or (v['type'] in types and fnmatchcase(v['id'], p)) for p in patterns)]
+        if since:
+            ref = next((v['releaseTime'] for v in versions if v['id'] == since), None)
+            if ref is None and not re.fullmatch(r"\d{4}(-\d{2}){0,2}", since):
+                print(f"[ ❌ ] \033[1;91mError:\033[0m --since {since} is neither a known version nor a date (YYYY[-MM[-DD]])")
+                sys.exit(1)
+            picked = [v for v in picked if v['releaseTime'] >= (ref or since)] # ISO timestamps compare as strings
+        return picked
+    
+    def prefetch_versions(picked):
+        enter_phase("prefetch resolve")
+        from concurrent.futures import ThreadPoolExecutor
+        net()
+        if not picked:
+            # A pattern that matches nothing is a typo, not a finished prefetch
+            print(f"[ ❌ ] \033[1;91mError:\033[0m No version matches: {' '.join(args.prefetch)}")
+            sys.exit(1)
+        todo = [v for v in picked if not os.path.exists(os.path.join(MC_DIR, f"versions/{v['id']}/.integrity_passed"))]
+        if not todo:
+            print(f"[ ✅ ] \033[1;92mNothing to prefetch:\033[0m {len(picked)} matching version/s, all already complete.")
+            sys.exit(0)
+        print(f"\n[ 📚 ] \033[1;97mPrefetching\033[0m \033[1;92m{len(todo)}\033[0m version/s ({len(picked) - len(todo)} already complete): {', '.join(v['id'] for v in todo[:10])}{' ...' if len(todo) > 10 else ''}")
+    
+        def resolve_version(v):
+            # (version, version JSON) or (version, error)
+            vj_path = os.path.join(MC_DIR, f"versions/{v['id']}/{v['id']}.json")
+            try:
+                if args.refresh or not os.path.exists(vj_path): fetch_conditional(v['url'], vj_path)
+                return v, read_json(vj_path)
+            except (OSError, ValueError, requests.exceptions.RequestException) as e: return v, e
+    
+        def resolve_index(ai):
+            # (names, hashes, sizes) of one index (shared by many versions, so each is fetched & parsed once) or the error
+            ai_path = os.path.join(MC_DIR, f"assets/indexes/{ai['id']}.json")
+            try:
+                fetch_conditional(ai['url'], ai_path, ai.get('sha1'), ai.get('size'))
+                return load_asset_index(ai_path)
+            except (OSError, ValueError, KeyError, requests.exceptions.RequestException) as e: return e
+    
+        # Every version JSON, then every distinct asset index, all in parallel
+        with ThreadPoolExecutor(max_workers=args.threads) as ex:
+            resolved = list(ex.map(resolve_version, todo))
+            failed = [(v, e) for v, e in resolved if isinstance(e, Exception)]
+            resolved = [(v, vj) for v, vj in resolved if not isinstance(vj, Exception)]
+            indexes = {vj['assetIndex']['id']: vj['assetIndex'] for _, vj in resolved if 'assetIndex' in vj}
+            loaded = dict(zip(indexes, ex.map(resolve_index, indexes.values())))
+        index_q = {ai: (r if isinstance(r, Exception) else asset_queue(r)) for ai, r in loaded.items()}
+        legacy = {ai: r[:2] for ai, r in loaded.items() if not isinstance(r, Exception)} if args.old_compatibility else {} # Names only matter for -O
+        del loaded
+    
+        # Deduplicate across versions: a library or object shared by every version is verified & downloaded once
+        libs, objects, plans = {}, {}, []
+        for v, vj in resolved:
+            aq = index_q.get(vj.get('assetIndex', {}).get('id'))
+            if isinstance(aq, Exception) or aq is None:
+                failed.append((v, aq or "no asset index"))
+                continue
+            lq = parse_version(vj, os.path.join(MC_DIR, f"versions/{v['id']}/{v['id']}.jar"))[0]
+            for x in lq: libs.setdefault(x[1], x)
+            for h, size in zip(aq.hashes, aq.sizes): objects.setdefault(h, size)
+            plans.append((v, vj, [x[1] for x in lq], aq))
+        for v, e in failed: print(f"[ ! ] \033[1;91mError:\033[0m {v['id']}: {e}")
+        total = sum(len(p[2]) + len(p[3]) for p in plans)
+        print(f"[ 📚 ] \033[1;97mResolved\033[0m {len(plans)} version/s: {total} files, {len(libs) + len(objects)} unique ({len(libs)} libraries, {len(objects)} objects)")
+    
+        repair = download_with_repair([("libraries", list(libs.values()), "  [ 🔍 ] \033[1;94mDownloading & Verifying Libs\033[0m"), ("assets", AssetQueue(objects), "  [ 🔍 ] \033[1;94mDownloading & Verifying Assets\033[0m")])
+    
+        # A version is complete once none of its files is left in the repair queue
+        done = []
+        failed_objects = {os.path.basename(p) for p in repair if p.startswith(AssetQueue.objects_dir)}
+        for v, vj, lib_paths, aq in plans:
+            if any(p in repair for p in lib_paths) or (failed_objects and any(h in failed_objects for h in aq.hashes)): continue
+            with open(os.path.join(MC_DIR, f"versions/{v['id']}/.integrity_passed"), 'w') as f: f.write("OK")
+            done.append(v['id'])
+        if args.old_compatibility:
+            # Sound compatibility fix for old versions
+            for ai_id in {vj['assetIndex']['id'] for v, vj, _, _ in plans if v['id'] in done}: reconstruct_legacy_resources(*legacy[ai_id])
+        print(f"\n[ {'✅' if len(done) == len(todo) else '⚠️'} ] \033[1;97mPrefetched\033[0m \033[1;92m{len(done)}\033[0m / {len(todo)} version/s")
+        if len(done) != len(todo): print(f"[ ❌ ] Incomplete: {', '.join(v['id'] for v in todo if v['id'] not in done)}")
+        print(f"\n[ 👋 ] \033[1;97mBYE...\033[0m\n")
+        sys.exit(0 if len(done) == len(todo) else 1)
     
     if not VERSION:
+        enter_phase("manifest")
+        # Stale-while-revalidate: render from the cache now, refresh in the background
+        background_refresh = args.revalidate and os.path.exists(manifest_cache)
         try:
-            if args.refresh or not os.path.exists(manifest_cache):
-                manifest_json_remote_source1 = b64d('aHR0cHM6Ly9sYXVuY2hlcm1ldGEubW9qYW5nLmNvbS9tYy9nYW1lL3ZlcnNpb25fbWFuaWZlc3QuanNvbg==')
-                manifest_json_remote_source2 = b64d('aHR0cHM6Ly9waXN0b24tbWV0YS5tb2phbmcuY29tL21jL2dhbWUvdmVyc2lvbl9tYW5pZmVzdC5qc29u')
-                try:
-                    r = session.get(manifest_json_remote_source1, timeout=15)
-                    r.raise_for_status()
-                except requests.exceptions.RequestException:
-                    print(f"[ ❌ ] Cannot fetch version list from {manifest_json_remote_source1}")
-                    print(f"     Trying {manifest_json_remote_source2}")
-                    r = session.get(manifest_json_remote_source2, timeout=15)
-                
-                manifest = r.json()
-                with open(manifest_cache, 'w') as f: json.dump(manifest, f)
-            else:
-                with open(manifest_cache, 'r') as f: manifest = json.load(f)
+            if not background_refresh and (args.refresh or not os.path.exists(manifest_cache)):
+                refresh_manifest()
+            manifest = read_json(manifest_cache)
         except:
             if os.path.exists(manifest_cache):
-                with open(manifest_cache, 'r') as f: manifest = json.load(f)
+                manifest = read_json(manifest_cache)
             else:
                 print("[ ❌ ] Failed to fetch version manifest and no cache available. Check your internet connection.")
                 sys.exit(1)
     
-        v_pool = [v for v in manifest['versions'] if v['type'] in (['snapshot'] if args.snapshots else (['old_beta', 'old_alpha'] if args.beta else ['release']))]
+        v_types = ['snapshot'] if args.snapshots else (['old_beta', 'old_alpha'] if args.beta else ['release'])
+        v_pool = [v for v in manifest['versions'] if v['type'] in v_types]
+        if args.prefetch: prefetch_versions(select_versions(manifest, args.prefetch, v_types, args.since))
+    
+        if background_refresh:
+            def revalidate_manifest():
+                try:
+                    if refresh_manifest(silent=True):
+                        fresh = read_json(manifest_cache)
+                        v_pool[:] = [v for v in fresh['versions'] if v['type'] in v_types] # The menu picks it up on the next key press
+                except Exception: pass # Keep showing the cached list
+            threading.Thread(target=revalidate_manifest, daemon=True).start()
+        enter_phase("version select")
         last_saved = ""
         if os.path.exists(last_v_file):
             with open(last_v_file, 'r') as f: last_saved = f.read().strip()
@@ -163,78 +1344,125 @@ try:
         # Version menu
         # Interactive Menu setup
         def interactive_select(options, last_saved=""):
-    
-            def get_linux_key():
-                fd = sys.stdin.fileno()
-                old_settings = termios.tcgetattr(fd)
-                try:
-                    tty.setraw(sys.stdin.fileno())
-                    ch = sys.stdin.read(1)
-                    # Handle Arrow keys
-                    if ch == '\x1b':
-                        ch += sys.stdin.read(2)
-                finally:
-                    termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
-                return ch
             # Dynamic arrow-key menu that scales with terminal height.
-            if not sys.stdout.isatty(): return None
+            # One cbreak session for the whole menu, only the lines that changed are rewritten, the size is re-read on SIGWINCH only.
+            if not sys.stdout.isatty() or not sys.stdin.isatty(): return None
+            import tty, termios, signal, select, re
+            # One read can hold several keys (held arrows, pasted text): split it into escape sequences & single characters
+            key_re = re.compile(r"\x1b(?:\[[0-9;]*[~A-Za-z]|O[A-Za-z])?|.", re.S)
     
-            total = len(options)
-            curr = 0
+            # Prebuilt search index: lowercase ids, in list order
+            view, ids = [], []
+            def reindex():
+                view[:] = list(options)
+                ids[:] = [v['id'].lower() for v in view]
+            reindex()
     
-            # FIND THE LAST USED VERSION INDEX
-            if last_saved:
-                for i, v in enumerate(options):
-                    if v['id'] == last_saved:
-                        curr = i
-                        break
-        
-            while True:
-                try:
-                    term_height = os.get_terminal_size().lines
-                    # Reserve 6 lines for header/footer
-                    window_size = max(5, term_height - 8)
-                except:
-                    window_size = 15
+            matches = list(range(len(view))) # Indexes into view that are listed (everything, or the filter hits)
+            curr = next((i for i, v in enumerate(view) if v['id'] == last_saved), 0) # Position in matches
+            query, searching, prefix, prefix_at = "", False, "", 0.0
+            term = {"resized": True, "lines": 24, "window": 15, "top": None}
+            screen = [] # What is on the terminal right now, one string per row
+            out = sys.stdout
     
-                print("\033[H\033[J", end="") # os.system('clear') ## Clear Screen
-                print(f"\n\033[1;96m------ Choose Game version ------\033[0m\n")
-                print(f"\033[1;97mNavigate: \033[1;96mArrows\033[1;97m ( \033[1;96m↑\033[1;97m and \033[1;96m↓\033[1;97m ) | \033[1;97mSelect: \033[1;96mEnter\033[1;97m | \033[1;97mUse less\033[0m / \033[1;97mPrint Mode (for fallback): \033[1;96mQ\033[1;97m\n")
+            def refilter(keep):
+                # Re-run the filter over the whole index, keep the cursor on view index keep if it is still listed
+                nonlocal matches, curr
+                matches = [i for i, vid in enumerate(ids) if query in vid] if query else list(range(len(view)))
+                curr = matches.index(keep) if keep in matches else 0
     
-                # CALCULATE WINDOW SLICE
-                # Keep the selection 'curr' within the visible window
-                start = max(0, min(curr - window_size // 2, total - window_size))
-                end = min(start + window_size, total)
+            def draw():
+                if term["resized"]:
+                    try: term["lines"] = os.get_terminal_size().lines
+                    except OSError: term["lines"] = 24
+                    term["window"], term["resized"] = max(5, term["lines"] - 9), False
+                    screen.clear()
+                    out.write("\033[2J") # Full repaint only after a resize
+                window, total = term["window"], len(matches)
     
+                # CALCULATE WINDOW SLICE
+                # The window only scrolls once 'curr' leaves it, so moving inside a page rewrites two rows
+                if term["top"] is None: term["top"] = curr - window // 2 # First draw centers the last selected version
+                term["top"] = min(term["top"], curr)
+                term["top"] = max(term["top"], curr - window + 1)
+                start = term["top"] = max(0, min(term["top"], total - window))
+                end = min(start + window, total)
+                lines = ["", "\033[1;96m------ Choose Game version ------\033[0m", "",
+                         "\033[1;97mNavigate: \033[1;96mArrows\033[1;97m ( \033[1;96m↑\033[1;97m \033[1;96m↓\033[1;97m ) \033[1;96mPgUp\033[1;97m/\033[1;96mPgDn\033[1;97m \033[1;96mHome\033[1;97m/\033[1;96mEnd\033[1;97m | Search: \033[1;96m/\033[1;97m | Jump: \033[1;96mtype a version\033[1;97m | Select: \033[1;96mEnter\033[1;97m | Use less\033[0m / \033[1;97mPrint Mode (for fallback): \033[1;96mQ\033[0m", ""]
                 for i in range(start, end):
-                    v = options[i]
-                    # Use different symbols for selected vs last-used
-                    is_selected = (i == curr)
-                    is_last = (v['id'] == last_saved)
+                    v = view[matches[i]]
+                    sel_prefix = "  \033[1;96m>> " if i == curr else "     \033[1;97m"
+                    line = f"{sel_prefix}{v['id']}\033[0m (\033[1;93m{v['type']}\033[0m)\033[0m"
+                    if v['id'] == last_saved: line += "  \033[1;91m<-- (Last Selected)\033[0m"
+                    lines.append(line)
+                lines += [""] * (window - (end - start) + 1) # Footer stays put when the list is short
+                lines.append(f"  [ \033[1;94m{curr + 1 if total else 0}\033[0m / \033[1;94m{total}\033[0m ] | Page: \033[1;94m{start + 1 if total else 0}\033[0m-\033[1;94m{end}\033[0m"
+                             + (f" | \033[1;97mSearch:\033[0m /\033[1;96m{query}\033[0m{'▏' if searching else ''}" if searching or query else ""))
     
-                    sel_prefix = "  \033[1;96m>> " if is_selected else "     \033[1;97m"
-                    sel_marker = "  [ \033[1;96mX\033[0m ]\033[1;96m" if is_selected else "  [   ]\033[1;97m" # Future Plan
+                # Cursor-address & rewrite only the rows that differ from the screen
+                changed = [f"\033[{row + 1};1H{line}\033[K" for row, line in enumerate(lines) if row >= len(screen) or screen[row] != line]
+                screen[:] = lines
+                if changed:
+                    out.write("".join(changed))
+                    out.flush()
     
-                    line = f"{sel_prefix}{v['id']}\033[0m (\033[1;93m{v['type']}\033[0m)\033[0m"
-                    if is_last:
-                        line += "  \033[1;91m<-- (Last Selected)\033[0m"
-    
-                    # Print the built line
-                    print(line)
-    
-                print(f"\n  [ \033[1;94m{curr + 1}\033[0m / \033[1;94m{total}\033[0m ] | Page: \033[1;94m{start+1}\033[0m-\033[1;94m{end}\033[0m")
-    
-                # INPUT HANDLING
-                key = get_linux_key()
-                if key == '\x1b[A': # If UP Arrow key is pressed,
-                    curr = max(0, curr -1)
-                elif key == '\x1b[B': # If DOWN Arrow key is pressed,
-                    curr = min(total - 1, curr + 1)
-                elif key in ('\r', '\n'): # If ENTER key is pressed (Carriage_Return-Line_Feed),
-                    return options[curr]
-                elif key.lower() == 'q': # Quit if 'Q' key is pressed
-                    print("\033[H\033[J", end="") # os.system('clear') ## Clear Screen
-                    return None
+            def on_resize(*_): term["resized"] = True
+            old_winch = signal.signal(signal.SIGWINCH, on_resize)
+            fd = sys.stdin.fileno()
+            old_settings = termios.tcgetattr(fd)
+            out.write("\033[?1049h\033[?25l") # Alternate screen, hidden cursor
+            try:
+                tty.setcbreak(fd) # Ctrl+C still raises KeyboardInterrupt
+                while True:
+                    # The list can grow while the menu is open (--revalidate), keep the cursor on the same version
+                    if len(options) != len(view):
+                        keep_id = view[matches[curr]]['id'] if matches else None
+                        reindex()
+                        refilter(next((i for i, v in enumerate(view) if v['id'] == keep_id), -1))
+                    draw()
+    
+                    # Wake up for resizes & list updates even without a key press
+                    if not select.select([fd], [], [], 0.25)[0]: continue
+                    buf = os.read(fd, 32).decode(errors="ignore")
+                    while re.search(r"\x1b(?:\[[0-9;]*|O)?$", buf) and select.select([fd], [], [], 0.05)[0]: buf += os.read(fd, 32).decode(errors="ignore") # Split escape sequence
+    
+                    for key in key_re.findall(buf):
+                        page, total = term["window"], len(matches)
+    
+                        # INPUT HANDLING
+                        if key in ("\x1b[A", "\x1bOA"): curr = max(0, curr - 1) # UP Arrow
+                        elif key in ("\x1b[B", "\x1bOB"): curr = min(total - 1, curr + 1) # DOWN Arrow
+                        elif key == "\x1b[5~": curr = max(0, curr - page) # Page Up
+                        elif key == "\x1b[6~": curr = min(total - 1, curr + page) # Page Down
+                        elif key in ("\x1b[H", "\x1b[1~", "\x1b[7~", "\x1bOH"): curr = 0 # Home
+                        elif key in ("\x1b[F", "\x1b[4~", "\x1b[8~", "\x1bOF"): curr = max(0, total - 1) # End
+                        elif key in ("\r", "\n"): # ENTER key
+                            if matches: return view[matches[curr]]
+                        elif key == "\x1b": # ESC leaves the search and shows everything again
+                            if searching or query:
+                                searching, query = False, ""
+                                refilter(matches[curr] if matches else -1)
+                        elif searching and key in ("\x7f", "\x08"): # Backspace widens the filter
+                            query = query[:-1]
+                            refilter(matches[curr] if matches else -1)
+                        elif searching and key.isprintable():
+                            # Typing narrows the current hits, no need to scan the whole index again
+                            keep = matches[curr] if matches else -1
+                            query += key.lower()
+                            matches = [i for i in matches if query in ids[i]]
+                            curr = matches.index(keep) if keep in matches else 0
+                        elif key == "/": searching = True
+                        elif key.lower() == "q": return None # Quit if 'Q' key is pressed
+                        elif key.isprintable() and matches:
+                            # Jump to the first version starting with what was typed (pause 1 s to start over)
+                            prefix = (prefix if time.time() - prefix_at < 1 else "") + key.lower()
+                            prefix_at = time.time()
+                            curr = next((n for n, i in enumerate(matches) if ids[i].startswith(prefix)), curr)
+            finally:
+                termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+                signal.signal(signal.SIGWINCH, old_winch)
+                out.write("\033[?25h\033[?1049l")
+                out.flush()
         
         # Interactive Menu comes first
         selected_obj = interactive_select(v_pool, last_saved)
@@ -263,149 +1491,300 @@ try:
                 except: pass
     
     # CHECK RUNTIME ASSETS & NATIVES
+    enter_phase("version json")
     v_root = os.path.join(MC_DIR, f"versions/{VERSION}")
     v_json_path = os.path.join(v_root, f"{VERSION}.json")
     integrity_marker = os.path.join(v_root, ".integrity_passed")
     
     if not args.offline:
         if args.refresh or not os.path.exists(v_json_path):
-            get(V_URL, v_json_path, silent=True)
+            try: fetch_conditional(V_URL, v_json_path)
+            except requests.exceptions.RequestException as e: print(f"[ ! ] \033[1;91mError:\033[0m {e}")
     
-    with open(v_json_path, 'r') as f: v_json = json.load(f)
+    launch_plan_path = os.path.join(v_root, "launch_plan.json")
     
-    jar_path = os.path.join(v_root, f"{VERSION}.jar")
+    with open(v_json_path, 'rb') as f: v_json_raw = f.read()
+    v_json = json_loads(v_json_raw)
     
-    # Only download jar if marker is missing
-    if not os.path.exists(integrity_marker) and not args.offline:
-        get(v_json['downloads']['client']['url'], jar_path, v_json['downloads']['client'].get('sha1'))
+    jar_path = os.path.join(v_root, f"{VERSION}.jar")
     
-    cp_paths, lib_queue, natives_queue = [jar_path], [], []
+    # The client jar is downloaded with the libraries (only while the integrity marker is missing)
+    lib_queue, cp_paths, natives_queue = parse_version(v_json, jar_path)
     
     # Mapping variables
-    natives_dir = os.path.join(v_root, '${natives_directory}')
-    os.makedirs(natives_dir, exist_ok=True)
-    
-    # Parse Libraries (for Linux)
-    for lib in v_json['libraries']:
-        if not is_allowed(lib.get('rules')): continue
-        dl = lib.get('downloads', {})
-        if 'artifact' in dl:
-            lp = os.path.join(MC_DIR, "libraries", dl['artifact']['path'])
-            lib_queue.append((dl['artifact']['url'], lp, dl['artifact'].get('sha1')))
-            cp_paths.append(lp)
-        # Explicitly look for Linux natives
-        if f"natives-{platform_os}" in dl.get('classifiers', {}):
-            n_data = dl['classifiers'][f"natives-{platform_os}"]
-            np = os.path.join(MC_DIR, "libraries", n_data['path'])
-            lib_queue.append((n_data['url'], np, n_data.get('sha1')))
-            natives_queue.append(np)
+    # Natives are extracted once per set of native jar digests and shared by every version using the same set
+    natives_key = hashlib.sha1("\n".join(sorted(f"{h or os.path.basename(p)}:{suffix}" for p, h, suffix in natives_queue)).encode()).hexdigest()
+    natives_dir = os.path.join(MC_DIR, "natives", natives_key)
+    natives_marker = os.path.join(natives_dir, ".complete")
     
     a_id = v_json['assetIndex']['id']
     a_path = os.path.join(MC_DIR, f"assets/indexes/{a_id}.json")
-    asset_q = []
+    a_entry = (v_json['assetIndex']['url'], a_path, v_json['assetIndex'].get('sha1'), v_json['assetIndex'].get('size'))
+    asset_q, a_index, asset_index_ok = AssetQueue({}), None, False
+    
+    def recheck_entry(path, expected_hash, expected_size):
+        # None if the file is intact, else "MISSING" or "CORRUPT"
+        try: st = os.stat(path)
+        except OSError: return "MISSING"
+        if st.st_size == 0 or (expected_size is not None and st.st_size != expected_size): return "CORRUPT" # Wrong size, no need to hash
+        if expected_hash and file_sha1(path) != expected_hash: return "CORRUPT"
+        return None
     
     # Prepare asset queue
-    if not args.offline:
-        if not os.path.exists(integrity_marker):
-            get(v_json['assetIndex']['url'], a_path, v_json['assetIndex'].get('sha1'), silent=True)
-        if os.path.exists(a_path):
-            with open(a_path, 'r') as f:
-                objs = json.load(f).get('objects', {})
-                res_link = b64d("aHR0cHM6Ly9yZXNvdXJjZXMuZG93bmxvYWQubWluZWNyYWZ0Lm5ldA==")
-                asset_q = [(f"{res_link}/{h[:2]}/{h}", os.path.join(MC_DIR, f"assets/objects/{h[:2]}/{h}"), h) for h in [d['hash'] for d in objs.values()]]
+    # A recheck looks at the index before anything reads it, --repair fetches a bad one again (even after --last)
+    enter_phase("asset index")
+    a_state = recheck_entry(*a_entry[1:]) if args.recheck else None
+    if (not args.offline and (not os.path.exists(integrity_marker) or args.recheck)) or (a_state and args.repair):
+        try: fetch_conditional(*a_entry)
+        except requests.exceptions.RequestException as e: print(f"[ ! ] \033[1;91mError:\033[0m {e}")
+    if (not args.offline or args.recheck) and os.path.exists(a_path):
+        try: a_index = load_asset_index(a_path)
+        except ValueError: print(f"[ ! ] \033[1;91mError:\033[0m asset index {a_id} is corrupt, no asset can be checked")
+        else:
+            asset_q, asset_index_ok = asset_queue(a_index), True
+            if not args.old_compatibility: a_index = None # Names are only needed to rebuild resources/
+    
+    # FULL RECHECK (-r): hash every file from scratch, ignoring the markers and the verification cache
+    def file_crc32(path):
+        import mmap, zlib
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0: return 0
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m: return zlib.crc32(m)
+    
+    def expected_natives():
+        # { extracted path: {(size, crc32), ...} } read from the native jars' zip directories
+        import zipfile
+        wanted = {}
+        for jar, _, suffix in natives_queue:
+            try:
+                with zipfile.ZipFile(jar) as z:
+                    for i in z.infolist():
+                        if i.filename.endswith(suffix): wanted.setdefault(os.path.join(natives_dir, os.path.basename(i.filename)), set()).add((i.file_size, i.CRC))
+            except (OSError, zipfile.BadZipFile): pass # The jar itself is reported by the library check
+        return wanted
+    
+    def recheck_native(path, candidates):
+        try: st = os.stat(path)
+        except OSError: return "MISSING"
+        if not any(st.st_size == size and file_crc32(path) == crc for size, crc in candidates): return "CORRUPT"
+        return None
+    
+    def referenced_files():
+        # (library paths, asset object hashes) used by the installed versions, None if some version can't be read
+        paths, hashes = set(), set()
+        for v in os.listdir(os.path.join(MC_DIR, "versions")):
+            vj_path = os.path.join(MC_DIR, f"versions/{v}/{v}.json")
+            if not os.path.isfile(vj_path): continue
+            try:
+                vj = read_json(vj_path)
+                paths.update(x[1] for x in parse_version(vj, os.path.join(MC_DIR, f"versions/{v}/{v}.jar"))[0])
+                hashes.update(load_asset_index(os.path.join(MC_DIR, f"assets/indexes/{vj['assetIndex']['id']}.json"))[1])
+            except (OSError, ValueError, KeyError): return None
+        return paths, hashes
+    
+    def find_extra_files(referenced, wanted_natives):
+        # Leftover .part files anywhere, plus (if every version could be read) unreferenced libraries & objects
+        extra = []
+        for top in ["libraries", "assets/objects"]:
+            for root, _, files in os.walk(os.path.join(MC_DIR, top)):
+                for n in files:
+                    p = os.path.join(root, n)
+                    if n.endswith((".part", ".tmp")) or (referenced is not None and (n not in referenced[1] if top == "assets/objects" else p not in referenced[0])): extra.append(p)
+        if os.path.isdir(natives_dir):
+            extra += [os.path.join(natives_dir, n) for n in os.listdir(natives_dir) if n != ".complete" and os.path.join(natives_dir, n) not in wanted_natives]
+        return extra
+    
+    if args.recheck:
+        enter_phase("recheck")
+        print(f"\n[ 🔍 ] \033[1;97mRechecking every file of VERSION:\033[0m \033[1;92m{VERSION}\033[0m")
+        started = time.time()
+        entries = {}
+        for x in lib_queue: entries.setdefault(x[1], x)
+        wanted_natives = expected_natives()
+    
+        def check_entry(x):
+            state = recheck_entry(x[1], x[2], x[3])
+            if not state and x[2]: record_verified(x[1], x[2])
+            return x, state, x[3] or 0
+    
+        def check_asset(i):
+            # Asset entries are built in the worker & only kept when something is wrong with them
+            x = asset_q[i]
+            state = recheck_entry(x[1], x[2], x[3])
+            if not state: record_verified(x[1], x[2])
+            return (x if state else None), state, asset_q.size(i)
+    
+        # Biggest files first so the pool doesn't end on one large jar
+        jobs = sorted(entries.values(), key=lambda x: -(x[3] or 0))
+        asset_order = sorted(range(len(asset_q)), key=lambda i: -asset_q.size(i))
+        total = sum(x[3] or 0 for x in jobs) + sum(asset_q.size(i) for i in asset_order)
+        # The index was checked (& repaired) before parsing it, one that still can't be parsed is corrupt whatever its hash says
+        if not a_state and not asset_index_ok: a_state = "CORRUPT" if os.path.exists(a_path) else "MISSING"
+        problems = [(a_state, a_entry)] if a_state else []
+        total += a_entry[3] or 0
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        with ThreadPoolExecutor(max_workers=args.threads) as ex, tqdm(total=total, unit="B", unit_scale=True, unit_divisor=1024, desc="  [ 🔍 ] \033[1;94mHashing\033[0m", leave=False) as bar:
+            futures = [ex.submit(check_entry, x) for x in jobs] + [ex.submit(check_asset, i) for i in asset_order]
+            count("files", len(futures))
+            futures += [ex.submit(lambda p, c: ((None, p, None, None), recheck_native(p, c), 0), p, c) for p, c in wanted_natives.items()]
+            for fu in as_completed(futures):
+                x, state, size = fu.result()
+                bar.update(size)
+                if state: problems.append((state, x))
+        for _, x in problems: verify_cache.pop(os.path.relpath(x[1], MC_DIR), None)
+        save_verify_cache()
+    
+        referenced = referenced_files()
+        if referenced is not None:
+            referenced[0].update(entries)
+            referenced[1].update(asset_q.hashes)
+        extra = find_extra_files(referenced, wanted_natives)
+    
+        # Machine readable report: one "STATE<TAB>path" line per problem, the same data as JSON in logs/
+        problems.sort(key=lambda p: (p[0], p[1][1]))
+        for state, x in problems: print(f"{state}\t{os.path.relpath(x[1], MC_DIR)}")
+        for p in sorted(extra): print(f"EXTRA\t{os.path.relpath(p, MC_DIR)}")
+        report = {"version": VERSION, "checked": len(futures) + 1, "bytes": total, "seconds": round(time.time() - started, 3),
+                  "corrupt": [os.path.relpath(x[1], MC_DIR) for s, x in problems if s == "CORRUPT"],
+                  "missing": [os.path.relpath(x[1], MC_DIR) for s, x in problems if s == "MISSING"],
+                  "extra": [os.path.relpath(p, MC_DIR) for p in sorted(extra)]}
+        with open(os.path.join(MC_DIR, "logs/recheck_report.json"), 'w') as f: json.dump(report, f, indent=2)
+        print(f"[ 📊 ] \033[1;97mChecked\033[0m {report['checked']} files ({human_bytes(total)}) \033[1;97min\033[0m {report['seconds']:.1f}s: "
+              f"\033[1;91m{len(report['corrupt'])} corrupt\033[0m, \033[1;93m{len(report['missing'])} missing\033[0m, \033[1;94m{len(report['extra'])} extra\033[0m")
+    
+        # Markers only skip verification, a failed recheck must not leave them claiming otherwise
+        if any(x[0] for _, x in problems) and os.path.exists(integrity_marker): os.remove(integrity_marker)
+        if any(x[0] is None for _, x in problems) and os.path.exists(natives_marker): os.remove(natives_marker)
+    
+        if not args.repair:
+            if problems or extra: print(f"[ ⚠️ ] \033[1;93mRun again with --repair to fix only these files.\033[0m")
+            sys.exit(1 if problems else 0)
+    
+        # Repair: drop the bad files (and their store objects if they are the same inode), the normal integrity pass downloads them again
+        for _, x in problems:
+            if not x[0] or x[1] == a_path or not os.path.exists(x[1]): continue # The index was fetched again before the recheck
+            if STORE_DIR and x[2] and os.path.exists(store_path(x[2])) and os.path.samefile(x[1], store_path(x[2])):
+                os.remove(store_path(x[2]))
+                store_cache.pop(x[2], None)
+                store_evicted.add(x[2])
+            os.remove(x[1])
+        for p in extra: os.remove(p)
+        if problems: print(f"[ 🔧 ] \033[1;97mRepairing\033[0m {len(problems)} file/s...")
+        args.game_download_only, args.offline = True, False # Never launch from a recheck, repairs need the network even after --last
     
     # INTEGRITY CHECK, RETRY & SUCCESS MARKER
     if args.offline or os.path.exists(integrity_marker):
         print(f"[ ✅ ] \033[1;92mIntegrity marker found.\033[0m \033[1;97mSkipping verification for VERSION:\033[0m \033[1;92m{VERSION}\033[0m")
     else:
-        max_retries = 7
-        success = False
-    
-        for attempt in range(max_retries):
-            print(f"\n[ \033[1;95m{attempt+1}\033[0m 🎯 ] \033[1;97mDownload/Verification Attempt:\033[0m ( \033[1;95m{attempt+1}\033[0m / \033[1;95m{max_retries}\033[0m )")
-    
-            # Run Downloads
-            with ThreadPoolExecutor(max_workers=args.threads) as ex:
-                if lib_queue:
-                    list(tqdm(ex.map(lambda x: get(x[0], x[1], x[2], silent=True), lib_queue), total=len(lib_queue), desc="  [ 🔍 ] \033[1;94mDownloading & Verifying Libs\033[0m", bar_format="{desc}: \033[1;92m{percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt} \033[0m files  "))
-                if asset_q:
-                    list(tqdm(ex.map(lambda x: get(x[0], x[1], x[2], silent=True), asset_q), total=len(asset_q), desc="  [ 🔍 ] \033[1;94mDownloading & Verifying Assets\033[0m", bar_format="{desc}: \033[1;92m{percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt} \033[0m items  "))
-    
-            # Final Integrity Check
-            missing = []
-            for _, path, _ in lib_queue:
-                if not os.path.exists(path) or os.path.getsize(path) == 0: missing.append(path)
-            for _, path, _ in asset_q:
-                if not os.path.exists(path) or os.path.getsize(path) == 0: missing.append(path)
-    
-            if not missing:
-                print("[ ✅ ] \033[1;92mAll files verified successfully.\033[0m")
-                with open(integrity_marker, 'w') as f: f.write("OK")
-                success = True
-                break
-            else:
-                print(f"[ ⚠️ ] \033[1;93mWarning:\033[0m {len(missing)} file/s failed to download or are corrupt:")
-                for m in missing[:15]: # Log first 15 missing files to stdout
-                    print(f" - {os.path.basename(m)}")
-                if len(missing) > 15: print(f" ... and {len(missing)-15} more.")
-    
-                if attempt < max_retries - 1:
-                    print("[ ⚠️ ] \033[1;93mRetrying missing files in 5 seconds...\033[0m")
-                    time.sleep(5)
+        repair = download_with_repair([("libraries", lib_queue, "  [ 🔍 ] \033[1;94mDownloading & Verifying Libs\033[0m"), ("assets", asset_q, "  [ 🔍 ] \033[1;94mDownloading & Verifying Assets\033[0m")])
+        # Without a readable asset index no asset was verified, the marker must not claim otherwise
+        success = not repair and asset_index_ok
+        if not asset_index_ok: print(f"[ ❌ ] \033[1;91mError:\033[0m asset index {a_id} is missing or corrupt, the assets were not verified")
+        if success:
+            print("[ ✅ ] \033[1;92mAll files verified successfully.\033[0m")
+            with open(integrity_marker, 'w') as f: f.write("OK")
         
-        if args.old_compatibility:
+        if args.old_compatibility and a_index:
             # Sound compatibility fix for old versions
-            shutil.copytree(os.path.join(MC_DIR, "assets"), os.path.join(MC_DIR, "resources"), dirs_exist_ok=True)
-            asset_index_path = os.path.join(MC_DIR, f"assets/indexes/{a_id}.json")
-            if os.path.exists(asset_index_path):
-                with open(asset_index_path, 'r') as f:
-                    index_data = json.load(f)
-                    objects = index_data.get('objects', {})
-                    
-                    # tqdm for visual feedback on sound mapping
-                    for name, info in tqdm(objects.items(), desc="[ 🔊 ] \033[1;94mReconstructing Legacy Sounds\033[0m", bar_format="{desc}: \033[1;92m{percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt}\033[0m items  "):
-                        h = info['hash']
-                        src_file = os.path.join(MC_DIR, f"assets/objects/{h[:2]}/{h}")
-                        dst_file = os.path.join(MC_DIR, "resources", name)
-                        
-                        if os.path.exists(src_file):
-                            os.makedirs(os.path.dirname(dst_file), exist_ok=True)
-                            if not os.path.exists(dst_file):
-                                shutil.copy2(src_file, dst_file)
-        
+            reconstruct_legacy_resources(*a_index[:2])
         
         if not success:
             print("\n[ ❌ ] \033[1;91mCritical Error:\033[0m Failed to download required files after multiple attempts.")
-            print(f"[ ❌ ] {len(missing)} files are still missing. \033[1;91mAborting launch.\033[0m")
+            print(f"[ ❌ ] {len(repair) + (not asset_index_ok)} files are still missing. \033[1;91mAborting launch.\033[0m")
             sys.exit(1)
     
     # Extract natives (Linux)
-    if not os.listdir(natives_dir):
-        print(f"[ 📂 ] \033[1;97mExtracting Natives...\033[0m ({platform_os})")
-        for np in natives_queue:
-            if os.path.exists(np):
-                try:
-                    with zipfile.ZipFile(np, 'r') as z:
-                        for n in [f for f in z.namelist() if f.endswith('.so')]:
-                            with z.open(n) as s, open(os.path.join(natives_dir, os.path.basename(n)), "wb") as d: d.write(s.read())
-                except: pass
+    def extract_natives(jar, suffix):
+        # Stream matching members to temp files and publish each with an atomic rename
+        import zipfile, shutil
+        with zipfile.ZipFile(jar, 'r') as z:
+            for n in [f for f in z.namelist() if f.endswith(suffix)]:
+                count("files")
+                dst = os.path.join(natives_dir, os.path.basename(n))
+                tmp = f"{dst}.{threading.get_ident()}.tmp"
+                with z.open(n) as s, open(tmp, "wb") as d: shutil.copyfileobj(s, d, 1024*1024)
+                os.replace(tmp, dst)
     
-        # ATTENTION NEEDED!!! (For linux only) Specifically extract libflite.so from the text2speech library if found
-        for lp in cp_paths:
-            if "text2speech" in lp and os.path.exists(lp):
-                try:
-                    with zipfile.ZipFile(lp, 'r') as z:
-                        for n in [f for f in z.namelist() if f.endswith('libflite.so')]:
-                            with z.open(n) as s, open(os.path.join(natives_dir, "libflite.so"), "wb") as d: d.write(s.read())
-                except: pass
+    # Only a finished extraction writes the marker, so an interrupted one gets repaired on the next run
+    enter_phase("natives")
+    if not os.path.exists(natives_marker):
+        print(f"[ 📂 ] \033[1;97mExtracting Natives...\033[0m ({platform_os})")
+        os.makedirs(natives_dir, exist_ok=True)
+        jobs = [(np, suffix) for np, _, suffix in natives_queue if os.path.exists(np)]
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=args.threads) as ex:
+            futures = [ex.submit(extract_natives, np, suffix) for np, suffix in jobs]
+        errors = [e for e in (fu.exception() for fu in futures) if e]
+        if errors or len(jobs) != len(natives_queue):
+            print(f"[ ⚠️ ] \033[1;93mWarning:\033[0m Natives extraction incomplete, it will be retried on next launch.")
+        else:
+            with open(natives_marker, 'w') as f: f.write("\n".join(h or "" for _, h, _ in natives_queue))
     
     # Exit the program if the user only wanted to download game files.
     if args.game_download_only:
-        print(f"\n[ ✅ ] \033[1;92mGame {VERSION} Downloaded Successfully\033[0m")
+        if args.recheck: print(f"\n[ ✅ ] \033[1;92mGame {VERSION} Repaired Successfully\033[0m")
+        else: print(f"\n[ ✅ ] \033[1;92mGame {VERSION} Downloaded Successfully\033[0m")
         print(f"\n[ ✅ ] \033[1;92m{platform_os} library included...\033[0m")
         print(f"\n[ 👋 ] \033[1;97mBYE...\033[0m\n")
         sys.exit(0)
     
+    # JVM PROFILES: collector, pause goals & thread counts sized from the cores the game may use
+    def jvm_profile_flags(profile, java_major, max_mb, cores):
+        # (profile actually used, flags, short description)
+        if profile == "none": return "none", [], "JVM defaults"
+        if profile == "auto": profile = "low-memory" if max_mb < 2048 or cores <= 2 else "low-latency"
+        gc_threads, conc_threads, jit_threads = max(1, cores), max(1, cores // 4), max(2, min(cores // 2, 8))
+        common = [f"-XX:CICompilerCount={jit_threads}", "-XX:+DisableExplicitGC", "-XX:+PerfDisableSharedMem"]
+        if profile == "low-latency" and java_major >= 17 and max_mb >= 6144:
+            # Big heaps on a modern JDK: concurrent ZGC, generational from 21 (the default from 23 on)
+            flags = ["-XX:+UseZGC", *(["-XX:+ZGenerational"] if java_major in (21, 22) else []), f"-XX:ConcGCThreads={conc_threads}"]
+            return profile, flags + common, f"ZGC{' (generational)' if java_major >= 21 else ''}, {conc_threads} concurrent GC threads, {jit_threads} JIT threads"
+        if profile == "low-latency":
+            # G1 tuned for short pauses & a large young generation (the game allocates lots of short lived objects)
+            flags = ["-XX:+UseG1GC", "-XX:MaxGCPauseMillis=50", "-XX:+UnlockExperimentalVMOptions", "-XX:G1NewSizePercent=30", "-XX:G1MaxNewSizePercent=40",
+                     f"-XX:G1HeapRegionSize={8 if max_mb >= 4096 else 4}M", "-XX:G1ReservePercent=20", "-XX:InitiatingHeapOccupancyPercent=15",
+                     "-XX:+ParallelRefProcEnabled", f"-XX:ParallelGCThreads={gc_threads}", f"-XX:ConcGCThreads={conc_threads}"]
+            return profile, flags + common, f"G1 50 ms pauses, {gc_threads}/{conc_threads} GC threads, {jit_threads} JIT threads"
+        if profile == "throughput":
+            flags = ["-XX:+UseParallelGC", f"-XX:ParallelGCThreads={gc_threads}"]
+            return profile, flags + common, f"Parallel GC, {gc_threads} GC threads, {jit_threads} JIT threads"
+        # low-memory: small footprint, the heap is given back when it isn't needed
+        if cores <= 2: flags = ["-XX:+UseSerialGC"]
+        else: flags = ["-XX:+UseG1GC", "-XX:MaxGCPauseMillis=100", "-XX:+UseStringDeduplication", f"-XX:ParallelGCThreads={min(gc_threads, 4)}", "-XX:ConcGCThreads=1"]
+        flags += ["-XX:MinHeapFreeRatio=10", "-XX:MaxHeapFreeRatio=30", "-XX:ReservedCodeCacheSize=128M", "-XX:CICompilerCount=2", "-XX:+DisableExplicitGC", "-XX:+PerfDisableSharedMem"]
+        return "low-memory", flags, f"{'Serial' if cores <= 2 else 'G1'} GC, shrinking heap, 2 JIT threads"
+    
+    # APPCDS ARCHIVES: a class data sharing archive per version, classpath & JDK, written when the game exits & mapped on later launches
+    def cds_archive_flags(java_major):
+        # (flags, what happens this launch), no flags when this JVM can't do dynamic archives
+        if not java_major or java_major < 13: return [], f"needs Java 13+ (found Java {java_major or 'unknown'})"
+        # The JVM refuses an archive once a jar or the JDK changes, so both are in the archive name
+        try: cp_state = [(p, st.st_size, st.st_mtime_ns) for p in cp_paths for st in [os.stat(p)]]
+        except OSError as e: return [], f"skipped, {os.path.relpath(e.filename, MC_DIR)} is missing (restore it with -r --repair)"
+        cds_dir = os.path.join(MC_DIR, "cache/cds", VERSION)
+        os.makedirs(cds_dir, exist_ok=True)
+        
+        # JDK 19+ maintains the archive by itself, older ones dump it once (ArchiveClassesAtExit) then map it (SharedArchiveFile)
+        probe = os.path.join(MC_DIR, "cache/cds/probe.jsa")
+        probe_flags = ["-Xshare:auto", *(["-XX:+AutoCreateSharedArchive", f"-XX:SharedArchiveFile={probe}"] if java_major >= 19 else [f"-XX:ArchiveClassesAtExit={probe}"])]
+        accepted = java_accepts(JAVA_BIN, probe_flags)
+        if os.path.exists(probe): os.remove(probe)
+        if not accepted: return [], "this JVM has no AppCDS support"
+        
+        archive_name = hashlib.sha1(json.dumps([java_runtime_key(JAVA_BIN)[0], cp_state]).encode()).hexdigest()[:16] + ".jsa"
+        archive = os.path.join(cds_dir, archive_name)
+        for name in os.listdir(cds_dir):
+            if name != archive_name: os.remove(os.path.join(cds_dir, name)) # Stale archives of an older classpath or JDK
+        ready = os.path.exists(archive) and os.path.getsize(archive) > 0
+        if ready: state = f"mapping {os.path.relpath(archive, MC_DIR)} ({human_bytes(os.path.getsize(archive))})"
+        else: state = "training launch, the archive is written when you quit the game"
+        
+        # -Xshare:auto: a refused or damaged archive only costs a warning in the game log, never the launch
+        if java_major >= 19: return ["-Xshare:auto", "-XX:+AutoCreateSharedArchive", f"-XX:SharedArchiveFile={archive}"], state
+        if ready: return ["-Xshare:auto", f"-XX:SharedArchiveFile={archive}"], state
+        if os.path.exists(archive): os.remove(archive)
+        return ["-Xshare:auto", f"-XX:ArchiveClassesAtExit={archive}"], state
+    
     # THE Local Authentication EXECUTION
     def build_cmd():
         def get_mb_value(size_str):
@@ -417,29 +1796,46 @@ try:
                 return int(size_str)
             except (ValueError, IndexError): return 2048 # Safe 2GB fallback on invalid input
     
-        max_mb = get_mb_value(MEMORY)
-        min_mb = min(1024, max_mb)
-    
-        # Base JVM Command
-        cmd = [JAVA_BIN, f"-Xmx{max_mb}M", f"-Xms{min_mb}M"]
-    
-        # AUTOMATIC HUGE PAGES DETECTION
-        # Check if Linux and if THP is enabled/supported
-        thp_path = "/sys/kernel/mm/transparent_hugepage/enabled"
-        use_huge_pages = False
-        huge_pages_confirm = False
-        intentionally_disabled_huge_pages = False
-        if os.path.exists(thp_path):
-            with open(thp_path, 'r') as f:
-                status = f.read()
-                if "[always]" in status or "[madvise]" in status:
-                    use_huge_pages = True
+        budget = memory_budget()
+        max_mb = recommended_heap_mb(budget) if MEMORY.strip().lower() == "auto" else get_mb_value(MEMORY)
+        
+        # LARGE PAGES: reserved hugetlbfs pages when the whole heap fits in them, else Transparent Huge Pages (THP)
+        huge_pages_confirm = ""
+        intentionally_disabled_huge_pages = args.disable_huge_pages
+        large_page_flags = []
         if not args.disable_huge_pages:
-            if use_huge_pages:
-                cmd.extend(["-XX:+UseLargePages", "-XX:+AlwaysPreTouch"])
-                huge_pages_confirm = True
-        else:
-            intentionally_disabled_huge_pages = True
+            if budget["hugetlb_free"] >= max_mb:
+                large_page_flags, huge_pages_confirm = ["-XX:+UseLargePages"], f"Huge pages (hugetlbfs, {budget['hugetlb_page']} MiB pages)"
+            elif thp_mode() in ("always", "madvise"):
+                large_page_flags, huge_pages_confirm = ["-XX:+UseTransparentHugePages"], f"Transparent Huge Pages (THP, {thp_mode()})"
+        
+        # JVM PROFILE (skipped when --jvm-flags already picks a collector, two collectors make the JVM refuse to start)
+        # Kept local: args feed the launch plan key, changing them here would make every --last miss the fast path
+        jvm_profile = "none" if any(f.startswith("-XX:+Use") and f.endswith("GC") for f in JVM_ARGS.split()) else args.jvm_profile
+        java_info = probe_java(JAVA_BIN) if jvm_profile != "none" or args.cds else None
+        java_major = (java_info or {}).get("major") or v_json.get('javaVersion', {}).get('majorVersion', 8)
+        cores = min(args.threads, len(os.sched_getaffinity(0)))
+        profile, profile_flags, profile_desc = jvm_profile_flags(jvm_profile, java_major, max_mb, cores)
+        if profile_flags and java_info and not java_accepts(JAVA_BIN, profile_flags):
+            # Keep what this JDK understands, one flag at a time
+            unlock = ["-XX:+UnlockExperimentalVMOptions"] if "-XX:+UnlockExperimentalVMOptions" in profile_flags else []
+            profile_flags = [f for f in profile_flags if f in unlock or java_accepts(JAVA_BIN, unlock + [f])]
+            profile_desc += " (flags this JDK rejects were dropped)"
+        
+        # Reserved hugetlbfs pages are taken from a pool set aside anyway, so that heap is committed up front (Xms = Xmx) & pre-touched.
+        # THP (madvise on most distros) only gets the flag: pinning would commit the whole heap on every default launch.
+        # low-memory never pins, its heap has to be able to shrink.
+        pinned = large_page_flags == ["-XX:+UseLargePages"] and profile != "low-memory"
+        min_mb = max_mb if pinned else min(1024, max_mb)
+        cmd = [JAVA_BIN, f"-Xmx{max_mb}M", f"-Xms{min_mb}M", *large_page_flags, *(["-XX:+AlwaysPreTouch"] if pinned else []), *profile_flags]
+        print(f"[ 🧠 ] \033[1;97mMemory plan:\033[0m \033[1;92m{max_mb}M\033[0m heap{' (Xms = Xmx, pre-touched)' if pinned else ''}, "
+              f"{budget['available']}M of {budget['total']}M available ({budget['limited_by']}), recommended {recommended_heap_mb(budget)}M")
+        print(f"[ ⚙️ ] \033[1;97mJVM profile:\033[0m \033[1;92m{profile}\033[0m ({profile_desc}, Java {java_major})")
+        
+        if args.cds:
+            cds_flags, cds_state = cds_archive_flags((java_info or {}).get("major"))
+            cmd.extend(cds_flags)
+            print(f"[ 📦 ] \033[1;97mAppCDS:\033[0m {cds_state}")
         
         # Appending remaining flags
         if not args.old_compatibility: cmd.append("--enable-native-access=ALL-UNNAMED")
@@ -475,15 +1871,21 @@ try:
             "${classpath}": ":".join(cp_paths) # Linux Classpath Separator
         }
     
+        def fill(arg):
+            # Placeholders can be embedded (e.g. -Djava.library.path=${natives_directory})
+            if "${" not in arg: return arg
+            for k, v in params.items(): arg = arg.replace(k, v)
+            return arg
+    
         if 'arguments' in v_json:
             for arg in v_json['arguments'].get('jvm', []):
-                if isinstance(arg, str): cmd.append(params.get(arg, arg))
+                if isinstance(arg, str): cmd.append(fill(arg))
                 elif isinstance(arg, dict) and is_allowed(arg.get('rules')):
                     val = arg['value'] if isinstance(arg['value'], list) else [arg['value']]
-                    cmd.extend([params.get(v, v) for v in val])
+                    cmd.extend([fill(v) for v in val])
             cmd.append(v_json['mainClass'])
             for arg in v_json['arguments'].get('game', []):
-                if isinstance(arg, str): cmd.append(params.get(arg, arg))
+                if isinstance(arg, str): cmd.append(fill(arg))
         else:
             cmd.extend(["-cp", ":".join(cp_paths), v_json['mainClass']])
             game_json_arguments = b64d("bWluZWNyYWZ0QXJndW1lbnRz")
@@ -496,49 +1898,40 @@ try:
         if DEMO_MODE: cmd.append('--demo')
         return cmd, huge_pages_confirm, intentionally_disabled_huge_pages
     
+    # JAVA RUNTIME: the version JSON says which Java major the game is built for
+    enter_phase("java")
+    v_mjvn = max(8, v_json.get('javaVersion', {}).get('majorVersion', 8))
+    if JAVA_BIN == "auto":
+        JAVA_BIN, java_info = match_java(v_mjvn, probe_runtimes(discover_java()))
+        if not JAVA_BIN:
+            print(f"[ ❌ ] \033[1;91mError:\033[0m No Java {v_mjvn} (or newer) found. Install one, or point \033[1;96m--java\033[0m at its java binary (\033[1;96m--java list\033[0m shows what was found).")
+            sys.exit(1)
+        note = "" if java_info["major"] == v_mjvn else f" (no Java {v_mjvn} found, using a newer one)"
+        print(f"[ ☕ ] \033[1;97mJava runtime:\033[0m \033[1;92m{java_info['version']}\033[0m {java_info['vendor']} {java_info['arch']} {JAVA_BIN}{note}")
+    else:
+        java_info = probe_java(JAVA_BIN)
+        if java_info and java_info.get("major") and java_info["major"] < v_mjvn:
+            better = match_java(v_mjvn, probe_runtimes(discover_java()))[0]
+            print(f"[ ⚠️ ] \033[1;93mWARNING:\033[0m {VERSION} needs Java {v_mjvn}, {JAVA_BIN} is Java {java_info['major']} (expect UnsupportedClassVersionError)."
+                  + (f"\n       \033[1;96m--java auto\033[0m would use {better}" if better else ""))
+    
+    enter_phase("build_cmd")
     final_cmd, huge_pages_active, intentionally_disabled_huge_pages = build_cmd()
     
-    v_mjvn = max(8, v_json['javaVersion']['majorVersion'])
+    # Classpath goes into a JVM @argfile (Java 9+) to keep the command line short
+    if v_mjvn >= 9 and "-cp" in final_cmd:
+        cp_at = final_cmd.index("-cp")
+        argfile = os.path.join(v_root, "classpath.args")
+        with open(argfile, 'w') as f: f.write('-cp\n"' + final_cmd[cp_at + 1].replace('\\', '\\\\').replace('"', '\\"') + '"\n')
+        final_cmd[cp_at:cp_at + 2] = [f"@{argfile}"]
     
-    if huge_pages_active:
-        print("\n[ ✅ ] \033[1;92mTransparent Huge Pages (THP) enabled\033[0m")
-    else:
-        if intentionally_disabled_huge_pages:
-            print("\n[ ℹ️ ] \033[1;96mTransparent Huge Pages (THP)\033[1;97m has been disabled by the user\033[0m.")
-        else:
-            print("\n[ ℹ️ ] \033[1;97mNOTE: \033[1;96mTransparent Huge Pages (THP)\033[1;97m not detected or disabled.\033[0m\n", 
-                  "      \033[1;97mFor optimal performance, consider enabling \033[1;96mTransparent Huge Pages (THP)\033[1;97m on your system (\033[1;96mOptional\033[1;97m).\033[0m")
-    
-    print(f"\n[ 👍 ] Finalizing... \n", 
-          f"        🎮 \033[1;97mGame Version:\033[0m \033[1;92m{VERSION}\033[0m\n", 
-          f"        👩 \033[1;97mPlayer Name:\033[0m \033[1;92m{USERNAME}\033[0m\n", 
-          f"        🎚️ \033[1;97mMax Allocated RAM:\033[0m \033[1;92m{MEMORY}\033[0m\n", 
-          f"        📈 \033[1;97mMax Thread Count:\033[0m \033[1;92m{MAX_THREAD_COUNT}\033[0m\n", 
-          f"        ☕ \033[1;97mRequired major Java Version:\033[0m \033[1;92m{v_mjvn}\033[0m\n"
-          )
-    
-    if DEMO_MODE: print(f"\n    [ ⚠️ ] \033[1;93mWARNING:\033[0m DEMO MODE enabled...\n", 
-                        f"    \033[1;97mYES, YOU did it... INTENTIONALLY!!!\033[0m\n", 
-                        f"    Have a nice \033[1;97m1 Hour 40 Minutes\033[0m DEMO!!!\n"
-                        )
-    
-    with open(os.path.join(MC_DIR, "logs/latest_launch.log"), "w") as f:
-        f.write(f"    (PLATFORM: {platform_os}) COMMAND EXECUTED:\n\n{' '.join(final_cmd)}\n\n")
-        f.write("#" * 25 + " GAME OUTPUT START " + "#" * 25 + "\n\n")
-        f.flush()
-        
-        # Detach and exit
-        subprocess.Popen(
-            final_cmd, 
-            cwd=MC_DIR, 
-            stdout=f, 
-            stderr=f, 
-            start_new_session=True
-        )
-        
-        print("[ ✅ ] \033[1;97mGame launch started.\033[0m")
-        print("[ ⏰ ] \033[1;97mPlease, be patient...\033[0m\n")
-        sys.exit(0)
+    # Compile the launch plan for the next --last launch (only once natives are complete & no classpath jar is missing)
+    if os.path.exists(natives_marker) and all(os.path.exists(p) for p in cp_paths):
+        with open(launch_plan_path, 'w') as f:
+            json.dump({"key": launch_plan_key(v_json_raw), "argv": final_cmd, "natives_dir": natives_dir, "java_major": v_mjvn,
+                       "huge_pages": [huge_pages_active, intentionally_disabled_huge_pages]}, f)
+    
+    launch_game(final_cmd, huge_pages_active, intentionally_disabled_huge_pages, v_mjvn)
 except KeyboardInterrupt:
     print("\n\n[ 💀 ] \033[1;91mShutdown requested by user. BYE...\033[0m\n")
     sys.exit(1)